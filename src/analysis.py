@@ -2,6 +2,7 @@
 Analysis module for the project.
 Functions for statistical analysis and visualizations.
 """
+import os
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -9,48 +10,85 @@ import seaborn as sns
 
 # Import from config
 from config import *
-
-def basic_descriptive_statistics(merged_data):
+from sql_backend import sql_descriptive_statistics, sql_correlation_matrix, sql_group_statistics
+from schema import widen_floats
+
+# Variables averaged in state-level statistics
+STATE_COLUMNS = [
+    'MedianHomeValue', 'Median_Income', 'Poverty_Rate',
+    'College_Educated_Pct', 'UnemploymentRate'
+]
+
+# Results a pipeline run can produce; 'data' is the merged dataset itself and
+# 'report' the HTML report built by report.build_report
+ANALYSIS_OUTPUTS = ["stats", "correlations", "states", "figures", "data", "summary", "report"]
+
+# Outputs that need the merged dataset in memory; the others can be computed by
+# the duckdb backend straight from a saved CSV or Parquet file
+FRAME_OUTPUTS = ["figures", "data", "summary", "report"]
+
+# File formats for saved tables
+OUTPUT_FORMATS = ["csv", "parquet", "json"]
+
+# Key statistics printed after the statistics table: label, statistic, column, format
+KEY_STATISTICS = [
+    ("Counties analyzed", "count", "MedianHomeValue", "{:.0f}"),
+    ("Average home value", "mean", "MedianHomeValue", "${:,.0f}"),
+    ("Average household income", "mean", "Median_Income", "${:,.0f}"),
+    ("Average poverty rate", "mean", "Poverty_Rate", "{:.1f}%"),
+    ("Average college educated", "mean", "College_Educated_Pct", "{:.1f}%"),
+    ("Average unemployment rate", "mean", "UnemploymentRate", "{:.1f}%"),
+]
+ADDITIONAL_STATISTICS = [
+    ("Median home value", "50%", "MedianHomeValue", "${:,.0f}"),
+    ("Median household income", "50%", "Median_Income", "${:,.0f}"),
+    ("Standard deviation of home values", "std", "MedianHomeValue", "${:,.0f}"),
+]
+
+def _present(merged_data, columns):
+    """Keep the columns present in a DataFrame; paths are assumed to have them all."""
+    if isinstance(merged_data, pd.DataFrame):
+        return [col for col in columns if col in merged_data.columns]
+    return list(columns)
+
+def basic_descriptive_statistics(merged_data, backend=ANALYSIS_BACKEND):
     """
     Calculate and display basic descriptive statistics.
 
     Args:
-        merged_data: Final merged dataset
+        merged_data: Final merged dataset, or a CSV/Parquet path with the duckdb backend
+        backend: 'pandas' or 'duckdb'
 
     Returns:
         pandas.DataFrame: Descriptive statistics table
     """
     print("BASIC DESCRIPTIVE STATISTICS")
 
-    # Select numeric columns
-    numeric_columns = merged_data.select_dtypes(include=[np.number]).columns.tolist()
-    stats = merged_data[numeric_columns].describe()
+    if backend == "duckdb":
+        stats = sql_descriptive_statistics(merged_data)
+    else:
+        # Select numeric columns
+        numeric_columns = merged_data.select_dtypes(include=[np.number]).columns.tolist()
+        stats = merged_data[numeric_columns].describe()
 
     # Display statistics
     print(stats)
 
-    # Key statistics
+    # Key and additional statistics of the sources that were loaded
     print("KEY STATISTICS")
-    print(f"Counties analyzed: {len(merged_data)}")
-    print(f"Average home value: ${merged_data['MedianHomeValue'].mean():,.0f}")
-    print(f"Average household income: ${merged_data['Median_Income'].mean():,.0f}")
-    print(f"Average poverty rate: {merged_data['Poverty_Rate'].mean():.1f}%")
-    print(f"Average college educated: {merged_data['College_Educated_Pct'].mean():.1f}%")
-    print(f"Average unemployment rate: {merged_data['UnemploymentRate'].mean():.1f}%")
-
-    # Additional statistics
-    print(f"Median home value: ${merged_data['MedianHomeValue'].median():,.0f}")
-    print(f"Median household income: ${merged_data['Median_Income'].median():,.0f}")
-    print(f"Standard deviation of home values: ${merged_data['MedianHomeValue'].std():,.0f}")
+    for label, statistic, column, fmt in KEY_STATISTICS + ADDITIONAL_STATISTICS:
+        if column in stats.columns:
+            print(f"{label}: {fmt.format(stats.loc[statistic, column])}")
 
     return stats
 
-def correlation_analysis(merged_data):
+def correlation_analysis(merged_data, backend=ANALYSIS_BACKEND):
     """
     Calculate correlations between key variables.
 
     Args:
-        merged_data: Final merged dataset
+        merged_data: Final merged dataset, or a CSV/Parquet path with the duckdb backend
+        backend: 'pandas' or 'duckdb'
 
     Returns:
         pandas.DataFrame: Correlation matrix
@@ -58,13 +96,16 @@ def correlation_analysis(merged_data):
     print("CORRELATION ANALYSIS")
 
     # Select key variables for correlation
-    corr_vars = [
+    corr_vars = _present(merged_data, [
         'MedianHomeValue', 'Median_Income', 'Poverty_Rate',
         'College_Educated_Pct', 'UnemploymentRate'
-    ]
+    ])
 
     # Calculate correlation matrix
-    correlation_matrix = merged_data[corr_vars].corr()
+    if backend == "duckdb":
+        correlation_matrix = sql_correlation_matrix(merged_data, corr_vars)
+    else:
+        correlation_matrix = merged_data[corr_vars].corr()
 
     print("Correlation matrix:")
     print(correlation_matrix)
@@ -78,15 +119,16 @@ def correlation_analysis(merged_data):
 
     return correlation_matrix
 
-def create_visualizations(merged_data):
+def county_overview_figure(merged_data):
     """
-    Create visualizations for the analysis.
+    Draw the county-level distribution, scatter and top-county panels.
 
     Args:
         merged_data: Final merged dataset
-    """
-    print("CREATING VISUALIZATIONS")
 
+    Returns:
+        matplotlib.figure.Figure: Figure with six panels
+    """
     # Set up the figure
     fig, axes = plt.subplots(2, 3, figsize=(15, 10))
     fig.suptitle('US County-Level Analysis', fontsize=16)
@@ -134,70 +176,163 @@ def create_visualizations(merged_data):
     axes[1, 2].set_title('Top 10 Counties by Home Value')
     axes[1, 2].set_xlabel('Median Home Value ($)')
 
-    plt.tight_layout()
-    plt.savefig('county_analysis_visualizations.png', dpi=300, bbox_inches='tight')
+    fig.tight_layout()
+    return fig
+
+def correlation_heatmap_figure(correlation_matrix):
+    """
+    Draw a correlation matrix as an annotated heatmap.
+
+    Args:
+        correlation_matrix: Correlation matrix
+
+    Returns:
+        matplotlib.figure.Figure: Heatmap figure
+    """
+    fig = plt.figure(figsize=(10, 8))
+    sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', center=0,
+                square=True, linewidths=1, cbar_kws={"shrink": .8}, ax=fig.gca())
+    plt.title('Correlation Matrix of Key Variables')
+    fig.tight_layout()
+    return fig
+
+def create_visualizations(merged_data, output_dir=OUTPUT_DIR):
+    """
+    Create visualizations for the analysis.
+
+    Args:
+        merged_data: Final merged dataset
+        output_dir: Directory to save the figures in
+    """
+    print("CREATING VISUALIZATIONS")
+
+    county_overview_figure(merged_data)
+    plt.savefig(os.path.join(output_dir, 'county_analysis_visualizations.png'), dpi=300, bbox_inches='tight')
     plt.show()
 
     print("Visualizations saved to 'county_analysis_visualizations.png'")
 
     # Create correlation heatmap
-    plt.figure(figsize=(10, 8))
-    corr_matrix = correlation_analysis(merged_data)
-    sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', center=0,
-                square=True, linewidths=1, cbar_kws={"shrink": .8})
-    plt.title('Correlation Matrix of Key Variables')
-    plt.tight_layout()
-    plt.savefig('correlation_matrix.png', dpi=300, bbox_inches='tight')
+    correlation_heatmap_figure(correlation_analysis(merged_data))
+    plt.savefig(os.path.join(output_dir, 'correlation_matrix.png'), dpi=300, bbox_inches='tight')
     plt.show()
 
     print("Correlation matrix saved to 'correlation_matrix.png'")
 
-def state_level_analysis(merged_data):
+def compute_state_statistics(merged_data):
     """
-    Perform analysis at state level.
+    Aggregate county data to state averages and county counts.
 
     Args:
-        merged_data: Final merged dataset
+        merged_data: Final merged dataset, or a subset of whole states
 
     Returns:
-        pandas.DataFrame: State-level aggregated statistics
+        pandas.DataFrame: State-level statistics sorted by average home value
     """
-    print("STATE-LEVEL ANALYSIS")
-
-    # Group by state and calculate averages
-    state_stats = merged_data.groupby('State').agg({
-        'MedianHomeValue': 'mean',
-        'Median_Income': 'mean',
-        'Poverty_Rate': 'mean',
-        'College_Educated_Pct': 'mean',
-        'UnemploymentRate': 'mean',
+    state_stats = merged_data.groupby('State', observed=True).agg({
+        **{col: 'mean' for col in _present(merged_data, STATE_COLUMNS)},
         'FIPS': 'count'  # Number of counties
     }).rename(columns={'FIPS': 'CountyCount'})
 
-    state_stats = state_stats.sort_values('MedianHomeValue', ascending=False)
+    return state_stats.sort_values('MedianHomeValue', ascending=False)
 
-    print("Top 10 states by average home value:")
-    print(state_stats[['MedianHomeValue', 'CountyCount']].head(10))
+def state_statistics_figure(state_stats):
+    """
+    Draw the states with the highest average home values.
 
-    print("Bottom 10 states by average home value:")
-    print(state_stats[['MedianHomeValue', 'CountyCount']].tail(10))
+    Args:
+        state_stats: State-level statistics
 
-    # Create state-level visualization
-    plt.figure(figsize=(12, 6))
+    Returns:
+        matplotlib.figure.Figure: Bar chart figure
+    """
+    fig = plt.figure(figsize=(12, 6))
     top_states = state_stats.nlargest(15, 'MedianHomeValue')
     plt.bar(range(len(top_states)), top_states['MedianHomeValue'])
     plt.xticks(range(len(top_states)), top_states.index, rotation=45, ha='right')
     plt.ylabel('Average Median Home Value ($)')
     plt.title('Top 15 States by Average Home Value')
-    plt.tight_layout()
-    plt.savefig('state_level_analysis.png', dpi=300, bbox_inches='tight')
+    fig.tight_layout()
+    return fig
+
+def plot_state_statistics(state_stats, output_dir=OUTPUT_DIR):
+    """
+    Plot the states with the highest average home values.
+
+    Args:
+        state_stats: State-level statistics
+        output_dir: Directory to save the figure in
+    """
+    state_statistics_figure(state_stats)
+    plt.savefig(os.path.join(output_dir, 'state_level_analysis.png'), dpi=300, bbox_inches='tight')
     plt.show()
 
     print("State-level analysis saved to 'state_level_analysis.png'")
 
+def state_level_analysis(merged_data, output_dir=OUTPUT_DIR, backend=ANALYSIS_BACKEND,
+                         plot=True):
+    """
+    Perform analysis at state level.
+
+    Args:
+        merged_data: Final merged dataset, or a CSV/Parquet path with the duckdb backend
+        output_dir: Directory to save the figure in
+        backend: 'pandas' or 'duckdb'
+        plot: Whether to save the state-level figure
+
+    Returns:
+        pandas.DataFrame: State-level aggregated statistics
+    """
+    print("STATE-LEVEL ANALYSIS")
+
+    # Group by state and calculate averages
+    if backend == "duckdb":
+        state_stats = sql_group_statistics(merged_data, _present(merged_data, STATE_COLUMNS))
+    else:
+        state_stats = compute_state_statistics(merged_data)
+
+    print("Top 10 states by average home value:")
+    print(state_stats[['MedianHomeValue', 'CountyCount']].head(10))
+
+    print("Bottom 10 states by average home value:")
+    print(state_stats[['MedianHomeValue', 'CountyCount']].tail(10))
+
+    # Create state-level visualization
+    if plot:
+        plot_state_statistics(state_stats, output_dir)
+
     return state_stats
 
-def save_analysis_results(merged_data, stats, correlation_matrix, state_stats):
+def save_table(df, output_dir, name, file_format=OUTPUT_FORMAT, index=True):
+    """
+    Save a result table in the requested file format.
+
+    Args:
+        df: Table to save
+        output_dir: Directory to save the file in
+        name: File name without extension
+        file_format: 'csv', 'parquet' or 'json'
+        index: Whether to keep the index
+
+    Returns:
+        str: Name of the written file
+    """
+    if file_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{file_format}', expected one of {OUTPUT_FORMATS}")
+
+    file_name = f"{name}.{file_format}"
+    path = os.path.join(output_dir, file_name)
+    if file_format == "parquet":
+        df.to_parquet(path, index=index)
+    elif file_format == "json":
+        widen_floats(df).to_json(path, orient="table", index=index)
+    else:
+        df.to_csv(path, index=index)
+    return file_name
+
+def save_analysis_results(merged_data, stats, correlation_matrix, state_stats,
+                          output_dir=OUTPUT_DIR, outputs=ANALYSIS_OUTPUTS,
+                          file_format=OUTPUT_FORMAT):
     """
     Save all analysis results to files.
 
@@ -206,70 +341,93 @@ def save_analysis_results(merged_data, stats, correlation_matrix, state_stats):
         stats: Descriptive statistics
         correlation_matrix: Correlation matrix
         state_stats: State-level statistics
+        output_dir: Directory to save the files in
+        outputs: Results to save, from ANALYSIS_OUTPUTS
+        file_format: File format of the saved tables
     """
     print("SAVING ANALYSIS RESULTS")
 
     # Save merged data
-    merged_data.to_csv('final_merged_data.csv', index=False)
-    print("Final dataset saved to 'final_merged_data.csv'")
+    if "data" in outputs:
+        file_name = save_table(merged_data, output_dir, 'final_merged_data', file_format, index=False)
+        print(f"Final dataset saved to '{file_name}'")
 
     # Save descriptive statistics
-    stats.to_csv('descriptive_statistics.csv')
-    print("Descriptive statistics saved to 'descriptive_statistics.csv'")
+    if "stats" in outputs and stats is not None:
+        file_name = save_table(stats, output_dir, 'descriptive_statistics', file_format)
+        print(f"Descriptive statistics saved to '{file_name}'")
 
     # Save correlation matrix
-    correlation_matrix.to_csv('correlation_matrix.csv')
-    print("Correlation matrix saved to 'correlation_matrix.csv'")
+    if "correlations" in outputs and correlation_matrix is not None:
+        file_name = save_table(correlation_matrix, output_dir, 'correlation_matrix', file_format)
+        print(f"Correlation matrix saved to '{file_name}'")
 
     # Save state statistics
-    state_stats.to_csv('state_level_statistics.csv')
-    print("State-level statistics saved to 'state_level_statistics.csv'")
+    if "states" in outputs and state_stats is not None:
+        file_name = save_table(state_stats, output_dir, 'state_level_statistics', file_format)
+        print(f"State-level statistics saved to '{file_name}'")
 
     # Create summary report
-    with open('analysis_summary.txt', 'w') as f:
-        f.write("ANALYSIS SUMMARY REPORT\n")
-        f.write("="*50 + "\n\n")
-        f.write(f"Total counties analyzed: {len(merged_data)}\n")
-        f.write(f"Average home value: ${merged_data['MedianHomeValue'].mean():,.0f}\n")
-        f.write(f"Average household income: ${merged_data['Median_Income'].mean():,.0f}\n")
-        f.write(f"Average poverty rate: {merged_data['Poverty_Rate'].mean():.1f}%\n")
-        f.write(f"Average college educated: {merged_data['College_Educated_Pct'].mean():.1f}%\n")
-        f.write(f"Average unemployment rate: {merged_data['UnemploymentRate'].mean():.1f}%\n\n")
-
-        f.write("TOP CORRELATIONS WITH HOME VALUE:\n")
-        home_value_corr = correlation_matrix['MedianHomeValue'].sort_values(ascending=False)
-        for var, corr in home_value_corr.items():
-            if var != 'MedianHomeValue':
-                f.write(f"{var}: {corr:.3f}\n")
-
-    print("Analysis summary saved to 'analysis_summary.txt'")
+    if "summary" in outputs:
+        with open(os.path.join(output_dir, 'analysis_summary.txt'), 'w') as f:
+            f.write("ANALYSIS SUMMARY REPORT\n")
+            f.write("="*50 + "\n\n")
+            f.write(f"Total counties analyzed: {len(merged_data)}\n")
+            for label, statistic, column, fmt in KEY_STATISTICS[1:]:
+                if column in merged_data.columns:
+                    f.write(f"{label}: {fmt.format(merged_data[column].mean())}\n")
+            f.write("\n")
+
+            if correlation_matrix is not None:
+                f.write("TOP CORRELATIONS WITH HOME VALUE:\n")
+                home_value_corr = correlation_matrix['MedianHomeValue'].sort_values(ascending=False)
+                for var, corr in home_value_corr.items():
+                    if var != 'MedianHomeValue':
+                        f.write(f"{var}: {corr:.3f}\n")
+
+        print("Analysis summary saved to 'analysis_summary.txt'")
+
     print("Analysis complete. Check generated files for results.")
 
-def run_analysis(merged_data):
+def run_analysis(merged_data, output_dir=OUTPUT_DIR, backend=ANALYSIS_BACKEND,
+                 outputs=ANALYSIS_OUTPUTS, file_format=OUTPUT_FORMAT):
     """
     Run complete analysis pipeline.
 
     Args:
-        merged_data: Final merged dataset
+        merged_data: Final merged dataset, or a CSV/Parquet path with the duckdb
+            backend when no output in FRAME_OUTPUTS is selected
+        output_dir: Directory to save figures and result files in
+        backend: 'pandas' or 'duckdb' for statistics, correlations and state rollups
+        outputs: Results to compute and save, from ANALYSIS_OUTPUTS
+        file_format: File format of the saved tables
 
     Returns:
-        dict: Dictionary containing all analysis results
+        dict: Dictionary containing all analysis results; skipped results are None
     """
     if merged_data is None:
         print("No data provided for analysis")
         return
 
     print("STARTING ANALYSIS")
-
-    # Run all analysis functions
-    stats = basic_descriptive_statistics(merged_data)
-    correlation_matrix = correlation_analysis(merged_data)
-    create_visualizations(merged_data)
-    state_stats = state_level_analysis(merged_data)
-    save_analysis_results(merged_data, stats, correlation_matrix, state_stats)
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Run only the analysis functions the selected outputs need
+    stats = correlation_matrix = state_stats = None
+    if "stats" in outputs:
+        stats = basic_descriptive_statistics(merged_data, backend)
+    if "correlations" in outputs or "summary" in outputs:
+        correlation_matrix = correlation_analysis(merged_data, backend)
+    if "figures" in outputs:
+        create_visualizations(merged_data, output_dir)
+    if "states" in outputs:
+        state_stats = state_level_analysis(merged_data, output_dir, backend,
+                                           plot="figures" in outputs)
+    save_analysis_results(merged_data, stats, correlation_matrix, state_stats, output_dir,
+                          outputs, file_format)
 
     return {
         'stats': stats,
         'correlation_matrix': correlation_matrix,
         'state_stats': state_stats
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,323 @@
+"""
+Benchmark suite for the project.
+Times and memory-profiles every pipeline stage on synthetic data and flags
+regressions against a stored baseline.
+
+Usage:
+    python src/benchmarks.py --sizes 3k 30k --months 12 300
+    python src/benchmarks.py --save-baseline
+    python src/benchmarks.py --fixtures fixtures
+"""
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import pandas as pd
+
+# Import from local modules
+from config import (
+    BENCHMARK_SIZES, BENCHMARK_MONTHS, BENCHMARK_SEED,
+    BENCHMARK_BASELINE_FILE, BENCHMARK_TOLERANCE, LATEST_DATE, CENSUS_YEAR, ZILLOW_URL,
+    CENSUS_ECONOMIC_FIELDS, CENSUS_EDUCATION_FIELDS
+)
+from data_loading import (
+    bls_data_url, read_zillow_csv, prepare_bls_data, prepare_census_economic_data,
+    prepare_census_education_data
+)
+from data_cleaning import clean_zillow_data
+from data_merging import merge_census_data, merge_all_data
+from analysis import basic_descriptive_statistics, correlation_analysis, state_level_analysis
+from synthetic_data import write_synthetic_sources
+from fixtures import url_fixture_name, census_fixture_name, read_json_fixture
+
+# Differences below these floors are treated as noise, not regressions
+MIN_SECONDS_DELTA = 0.05
+MIN_MEMORY_DELTA_MB = 5.0
+
+def pipeline_stages(paths, output_dir):
+    """
+    Describe the pipeline stages in execution order.
+
+    Each stage is a name and a function taking the outputs of earlier stages.
+
+    Args:
+        paths: Source file paths from write_synthetic_sources or fixture_sources
+        output_dir: Directory for figures saved by analysis stages
+
+    Returns:
+        list: (stage name, function) pairs
+    """
+    return [
+        ("load_zillow", lambda r: read_zillow_csv(paths["zillow"], [LATEST_DATE])),
+        ("load_bls", lambda r: prepare_bls_data(pd.read_csv(paths["bls"], skiprows=1))),
+        ("load_census_economic",
+         lambda r: prepare_census_economic_data(read_json_fixture(paths["census_economic"]))),
+        ("load_census_education",
+         lambda r: prepare_census_education_data(read_json_fixture(paths["census_education"]))),
+        ("merge_census",
+         lambda r: merge_census_data(r["load_census_economic"], r["load_census_education"])),
+        ("clean_zillow", lambda r: clean_zillow_data(r["load_zillow"])),
+        ("merge_all_data",
+         lambda r: merge_all_data(r["clean_zillow"], r["merge_census"], r["load_bls"])),
+        ("descriptive_statistics", lambda r: basic_descriptive_statistics(r["merge_all_data"])),
+        ("correlation_analysis", lambda r: correlation_analysis(r["merge_all_data"])),
+        ("state_level_analysis", lambda r: state_level_analysis(r["merge_all_data"], output_dir)),
+    ]
+
+def fixture_sources(fixture_dir, year=CENSUS_YEAR):
+    """
+    Return the paths of recorded source fixtures in the layout of
+    write_synthetic_sources.
+
+    Args:
+        fixture_dir: Directory holding recorded fixtures
+        year: Data year the fixtures were recorded for
+
+    Returns:
+        dict: Fixture paths keyed by source name
+    """
+    names = {
+        "zillow": url_fixture_name("zillow", ZILLOW_URL),
+        "bls": url_fixture_name("bls", bls_data_url(year)),
+        "census_economic": census_fixture_name(CENSUS_ECONOMIC_FIELDS, year),
+        "census_education": census_fixture_name(CENSUS_EDUCATION_FIELDS, year),
+    }
+    paths = {source: os.path.join(fixture_dir, name) for source, name in names.items()}
+
+    missing = [path for path in paths.values() if not os.path.exists(path)]
+    if missing:
+        raise FileNotFoundError(f"Missing recorded fixtures: {', '.join(missing)}")
+    return paths
+
+def profile_stage(func, results, repeat=1):
+    """
+    Time a stage and measure its peak traced memory.
+
+    Timing runs are made without tracing so tracemalloc overhead does not
+    distort them; one extra traced run measures peak memory.
+
+    Args:
+        func: Stage function taking the results of earlier stages
+        results: Outputs of earlier stages keyed by stage name
+        repeat: Number of timed runs; the fastest is reported
+
+    Returns:
+        tuple: Stage output, best wall time in seconds, peak memory in MB
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = func(results)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func(results)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    plt.close("all")
+
+    return output, min(timings), peak / 1024 ** 2
+
+def run_benchmarks(sizes, months, repeat=1, seed=BENCHMARK_SEED):
+    """
+    Run every pipeline stage for each combination of size and month count.
+
+    Args:
+        sizes: Size labels from BENCHMARK_SIZES
+        months: Numbers of monthly Zillow columns
+        repeat: Number of timed runs per stage
+        seed: Random seed for the synthetic data
+
+    Returns:
+        list: One dict per (size, months, stage) with seconds, peak_mb and rows
+    """
+    measurements = []
+
+    for size in sizes:
+        for n_months in months:
+            with tempfile.TemporaryDirectory() as work_dir:
+                print(f"Generating synthetic data: {size} counties, {n_months} months...")
+                paths = write_synthetic_sources(work_dir, BENCHMARK_SIZES[size], n_months, seed)
+
+                measurements += profile_pipeline(paths, work_dir, size, n_months, repeat)
+
+    return measurements
+
+def run_fixture_benchmarks(fixture_dir, repeat=1, year=CENSUS_YEAR):
+    """
+    Run every pipeline stage on recorded source fixtures.
+
+    Args:
+        fixture_dir: Directory holding recorded fixtures
+        repeat: Number of timed runs per stage
+        year: Data year the fixtures were recorded for
+
+    Returns:
+        list: One dict per stage with seconds, peak_mb and rows
+    """
+    paths = fixture_sources(fixture_dir, year)
+    print(f"Benchmarking recorded fixtures in '{fixture_dir}'...")
+    with tempfile.TemporaryDirectory() as work_dir:
+        return profile_pipeline(paths, work_dir, "fixtures", "recorded", repeat)
+
+def profile_pipeline(paths, work_dir, size, n_months, repeat=1):
+    """
+    Profile every pipeline stage on one set of source files.
+
+    Args:
+        paths: Source file paths keyed by source name
+        work_dir: Directory for figures saved by analysis stages
+        size: Size label recorded with the measurements
+        n_months: Month count label recorded with the measurements
+        repeat: Number of timed runs per stage
+
+    Returns:
+        list: One dict per stage with seconds, peak_mb and rows
+    """
+    measurements = []
+    results = {}
+    for stage, func in pipeline_stages(paths, work_dir):
+        with contextlib.redirect_stdout(io.StringIO()):
+            output, seconds, peak_mb = profile_stage(func, results, repeat)
+        results[stage] = output
+
+        measurements.append({
+            "size": size,
+            "months": n_months,
+            "stage": stage,
+            "seconds": round(seconds, 4),
+            "peak_mb": round(peak_mb, 2),
+            "rows": len(output),
+        })
+        print(f"  {stage:<24} {seconds:>9.3f}s {peak_mb:>10.1f} MB {len(output):>9} rows")
+
+    return measurements
+
+def _key(measurement):
+    """Identify a measurement across benchmark runs."""
+    return f"{measurement['size']}/{measurement['months']}/{measurement['stage']}"
+
+def compare_to_baseline(measurements, baseline, tolerance=BENCHMARK_TOLERANCE):
+    """
+    Compare measurements against a stored baseline.
+
+    A stage regresses when its time or peak memory exceeds the baseline by
+    more than the tolerance factor and by more than the noise floor, or when
+    it produces a different number of rows.
+
+    Args:
+        measurements: Measurements from run_benchmarks
+        baseline: Baseline measurements keyed by size/months/stage
+        tolerance: Allowed slowdown or memory growth factor
+
+    Returns:
+        list: Descriptions of regressed stages
+    """
+    regressions = []
+    for m in measurements:
+        base = baseline.get(_key(m))
+        if base is None:
+            continue
+
+        if (m["seconds"] > base["seconds"] * tolerance
+                and m["seconds"] - base["seconds"] > MIN_SECONDS_DELTA):
+            regressions.append(f"{_key(m)}: time {base['seconds']:.3f}s -> {m['seconds']:.3f}s")
+        if (m["peak_mb"] > base["peak_mb"] * tolerance
+                and m["peak_mb"] - base["peak_mb"] > MIN_MEMORY_DELTA_MB):
+            regressions.append(f"{_key(m)}: memory {base['peak_mb']:.1f} MB -> {m['peak_mb']:.1f} MB")
+        if m["rows"] != base["rows"]:
+            regressions.append(f"{_key(m)}: rows {base['rows']} -> {m['rows']}")
+
+    return regressions
+
+def load_baseline(path=BENCHMARK_BASELINE_FILE):
+    """
+    Load stored baseline measurements.
+
+    Args:
+        path: Baseline JSON file
+
+    Returns:
+        dict: Baseline measurements keyed by size/months/stage, empty if missing
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def save_baseline(measurements, path=BENCHMARK_BASELINE_FILE):
+    """
+    Merge measurements into the stored baseline.
+
+    Args:
+        measurements: Measurements from run_benchmarks
+        path: Baseline JSON file
+    """
+    baseline = load_baseline(path)
+    baseline.update({_key(m): m for m in measurements})
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+    print(f"Baseline saved to '{path}'")
+
+def main(argv=None):
+    """
+    Run the benchmark suite from the command line.
+
+    Returns:
+        int: Exit code, 1 when a regression was found
+    """
+    parser = argparse.ArgumentParser(description="Benchmark pipeline stages on synthetic data")
+    parser.add_argument("--sizes", nargs="+", default=["3k"], choices=list(BENCHMARK_SIZES))
+    parser.add_argument("--months", nargs="+", type=int, default=BENCHMARK_MONTHS)
+    parser.add_argument("--repeat", type=int, default=1, help="Timed runs per stage")
+    parser.add_argument("--seed", type=int, default=BENCHMARK_SEED)
+    parser.add_argument("--baseline", default=BENCHMARK_BASELINE_FILE, help="Baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=BENCHMARK_TOLERANCE)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store these results as the new baseline")
+    parser.add_argument("--output", help="Write the measurements to this JSON file")
+    parser.add_argument("--fixtures", help="Benchmark recorded source fixtures in this "
+                                           "directory instead of synthetic data")
+    args = parser.parse_args(argv)
+
+    if args.fixtures:
+        measurements = run_fixture_benchmarks(args.fixtures, args.repeat)
+    else:
+        measurements = run_benchmarks(args.sizes, args.months, args.repeat, args.seed)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(measurements, f, indent=2)
+
+    if args.save_baseline:
+        save_baseline(measurements, args.baseline)
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if not baseline:
+        print(f"No baseline found at '{args.baseline}'. Run with --save-baseline to create one.")
+        return 0
+
+    regressions = compare_to_baseline(measurements, baseline, args.tolerance)
+    if regressions:
+        print("PERFORMANCE REGRESSIONS:")
+        for regression in regressions:
+            print(regression)
+        return 1
+
+    print("No regressions against baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,15 +7,87 @@ Contains all constants, URLs, and settings used throughout the project.
 ZILLOW_URL = "https://files.zillowstatic.com/research/public_csvs/zhvi/County_zhvi_uc_sfrcondo_tier_0.33_0.67_sm_sa_month.csv"
 BLS_FILE_ID = "190XVquIr4BWg97RKJY5fmFSHN6Xf7a_m"
 BLS_DATA_URL = f"https://docs.google.com/spreadsheets/d/{BLS_FILE_ID}/export?format=csv"
+BLS_SHEET_URL = "https://docs.google.com/spreadsheets/d/{file_id}/export?format=csv"
+
+# BLS county sheets per year; years without an entry cannot be loaded
+BLS_FILE_IDS = {
+    2022: BLS_FILE_ID,
+}
+
+# Zillow columns used besides the monthly value columns
+ZILLOW_KEY_COLUMNS = ["RegionName", "State", "StateCodeFIPS", "MunicipalCodeFIPS"]
+
+# ACS 5-year fields requested from the Census API
+CENSUS_ECONOMIC_FIELDS = ["NAME", "B19013_001E", "B01003_001E", "B17001_002E"]
+CENSUS_EDUCATION_FIELDS = [
+    "NAME", "B15003_022E", "B15003_023E", "B15003_024E", "B15003_025E", "B15003_001E"
+]
 
 # Data processing parameters
 CENSUS_YEAR = 2022
 LATEST_DATE = "2022-12-31"
 
+# Multi-year pipeline parameters
+MULTI_YEAR_START = min(BLS_FILE_IDS)
+MULTI_YEAR_END = max(BLS_FILE_IDS)
+MAX_WORKERS = None  # None uses one worker per CPU
+
+# Output locations
+OUTPUT_DIR = "."
+OUTPUT_FORMAT = "csv"  # "csv", "parquet" or "json" for saved tables
+PANEL_DATA_FILE = "panel_data.csv"
+PANEL_STATE_STATISTICS_FILE = "panel_state_statistics.csv"
+
+# HTML report settings; the section cache lives inside the output directory
+REPORT_FILE = "analysis_report.html"
+REPORT_CACHE_DIR = ".report_cache"
+REPORT_FIGURE_DPI = 100
+
 # Visualization settings
 PLOT_STYLE = "default"
 SEABORN_PALETTE = "husl"
 PD_DISPLAY_MAX_COLUMNS = 50
 
 # Environment variable names
-CENSUS_API_KEY_VAR = "CENSUS_API_KEY"
\ No newline at end of file
+CENSUS_API_KEY_VAR = "CENSUS_API_KEY"
+SOURCE_MODE_VAR = "PIPELINE_SOURCE_MODE"
+FIXTURE_DIR_VAR = "PIPELINE_FIXTURE_DIR"
+
+# Source access: "live" fetches from the network, "record" also saves the raw
+# responses as fixtures, "replay" serves saved fixtures without network access
+SOURCE_MODE = "live"
+FIXTURE_DIR = "fixtures"
+
+# Similarity index settings
+SIMILARITY_FEATURES = [
+    "Median_Income", "Population", "Poverty_Rate",
+    "College_Educated_Pct", "UnemploymentRate"
+]
+SIMILARITY_NEIGHBORS = 5
+SIMILARITY_TOP_FEATURES = 3
+
+# Spatial analysis settings; the adjacency file is the Census county adjacency
+# list, or a CSV with FIPS and NeighborFIPS columns
+ADJACENCY_FILE = "county_adjacency.txt"
+SPATIAL_FEATURES = ["MedianHomeValue"] + SIMILARITY_FEATURES
+SPATIAL_LAG_SUFFIX = "_Lag"
+
+# Query service settings
+MERGED_DATA_FILE = "final_merged_data.csv"
+QUERY_SERVICE_HOST = "127.0.0.1"
+QUERY_SERVICE_PORT = 8050
+QUERY_CACHE_SIZE = 256
+QUERY_LATENCY_WINDOW = 1000
+
+# Benchmark settings
+BENCHMARK_SIZES = {"3k": 3_000, "30k": 30_000, "300k": 300_000}
+BENCHMARK_MONTHS = [12, 300]
+BENCHMARK_SEED = 42
+BENCHMARK_BASELINE_FILE = "benchmark_baseline.json"
+BENCHMARK_TOLERANCE = 1.25
+
+# Analysis backend: "pandas" or "duckdb"
+ANALYSIS_BACKEND = "pandas"
+DUCKDB_THREADS = None  # None uses all cores
+DUCKDB_MEMORY_LIMIT = None  # e.g. "4GB"; larger inputs spill to DUCKDB_TEMP_DIRECTORY
+DUCKDB_TEMP_DIRECTORY = None
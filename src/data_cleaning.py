@@ -6,13 +6,15 @@ import pandas as pd
 
 # Import from config
 from config import LATEST_DATE
+from schema import apply_schema
 
-def clean_zillow_data(zillow_df):
+def clean_zillow_data(zillow_df, date_column=LATEST_DATE):
     """
     Clean and prepare Zillow home value data.
 
     Args:
         zillow_df: Raw Zillow home value data
+        date_column: Month-end column holding the home values to use
 
     Returns:
         pandas.DataFrame: Cleaned Zillow data with FIPS codes and home values
@@ -21,7 +23,7 @@ def clean_zillow_data(zillow_df):
 
     # Select relevant columns
     zillow_clean = zillow_df[
-        ["RegionName", "State", "StateCodeFIPS", "MunicipalCodeFIPS", LATEST_DATE]
+        ["RegionName", "State", "StateCodeFIPS", "MunicipalCodeFIPS", date_column]
     ].copy()
 
     # Rename columns
@@ -35,6 +37,7 @@ def clean_zillow_data(zillow_df):
 
     # Select final columns and drop missing values
     zillow_final = zillow_clean[["FIPS", "County", "State", "MedianHomeValue"]].dropna()
+    zillow_final = apply_schema(zillow_final, "Zillow")
 
     print(f"Zillow data cleaned: {zillow_final.shape[0]} counties")
     return zillow_final
\ No newline at end of file
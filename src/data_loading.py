@@ -9,41 +9,145 @@ from dotenv import load_dotenv
 
 # Import from config
 from config import *
+from schema import apply_schema
+from fixtures import open_csv_source, census_rows
 
 # Load environment variables from .env file
 load_dotenv()
 
 # Get API key from environment variable
 CENSUS_API_KEY = os.getenv(CENSUS_API_KEY_VAR)
-if not CENSUS_API_KEY:
-    raise ValueError("CENSUS_API_KEY not found. Please add it to .env file")
 
-census_client = Census(CENSUS_API_KEY)
+# Census client is created on first use so offline code can import this module
+_census_client = None
 
-def load_zillow_data():
+def get_census_client():
     """
-    Load Zillow home value data from URL.
+    Return the Census API client, creating it on first use.
+
+    Returns:
+        census.Census: Authenticated Census API client
+    """
+    global _census_client
+    if _census_client is None:
+        if not CENSUS_API_KEY:
+            raise ValueError("CENSUS_API_KEY not found. Please add it to .env file")
+        _census_client = Census(CENSUS_API_KEY)
+    return _census_client
+
+def read_zillow_csv(source, date_columns=None):
+    """
+    Read a Zillow home value CSV, keeping only the columns the pipeline uses.
+
+    Args:
+        source: URL or path of the Zillow CSV
+        date_columns: Month-end columns to keep; all columns when None
+
+    Returns:
+        pandas.DataFrame: Zillow home value data
+    """
+    if date_columns is None:
+        return pd.read_csv(source)
+
+    wanted = set(ZILLOW_KEY_COLUMNS) | set(date_columns)
+    return pd.read_csv(
+        source,
+        usecols=lambda column: column in wanted,
+        dtype={column: "float32" for column in date_columns},
+    )
+
+def load_zillow_data(date_columns=(LATEST_DATE,)):
+    """
+    Load Zillow home value data from URL, or from its fixture when replaying.
+
+    Args:
+        date_columns: Month-end columns to keep; all columns when None
 
     Returns:
         pandas.DataFrame: Raw Zillow home value data
     """
     print("Loading Zillow home value data...")
-    zillow_df = pd.read_csv(ZILLOW_URL)
+    zillow_df = read_zillow_csv(open_csv_source(ZILLOW_URL, "zillow"), date_columns)
     print(f"Zillow data loaded: {zillow_df.shape[0]} counties, {zillow_df.shape[1]} columns")
     return zillow_df
 
-def load_bls_data():
+def load_merged_data(path):
+    """
+    Load a merged dataset saved by save_analysis_results.
+
+    Args:
+        path: CSV, Parquet or JSON file of the merged dataset
+
+    Returns:
+        pandas.DataFrame: Merged dataset with schema dtypes
+    """
+    print(f"Loading merged data from '{path}'...")
+    if path.endswith(".parquet"):
+        merged_data = pd.read_parquet(path)
+    elif path.endswith(".json"):
+        merged_data = pd.read_json(path, orient="table")
+    else:
+        merged_data = pd.read_csv(path, dtype={"FIPS": str})
+    return apply_schema(merged_data, "Merged")
+
+def bls_data_url(year=CENSUS_YEAR):
+    """
+    Return the Google Sheets export URL of the BLS sheet for a year.
+
+    Args:
+        year: Data year
+
+    Returns:
+        str: CSV export URL
+
+    Raises:
+        ValueError: If no sheet is configured for the year
+    """
+    if year not in BLS_FILE_IDS:
+        raise ValueError(f"No BLS sheet configured for {year}; add it to BLS_FILE_IDS in config.py")
+    return BLS_SHEET_URL.format(file_id=BLS_FILE_IDS[year])
+
+def read_bls_sheet(year=CENSUS_YEAR):
+    """
+    Read the raw BLS sheet for a year from Google Sheets, or from its fixture
+    when replaying.
+
+    Args:
+        year: Data year
+
+    Returns:
+        pandas.DataFrame: Raw BLS sheet rows
+    """
+    return pd.read_csv(open_csv_source(bls_data_url(year), "bls"), skiprows=1)
+
+def load_bls_data(year=CENSUS_YEAR):
     """
     Load BLS unemployment data from Google Sheets.
 
+    Args:
+        year: Data year
+
     Returns:
         pandas.DataFrame: Processed BLS data with FIPS codes and unemployment rates
     """
-    print("Loading BLS unemployment data...")
+    print(f"Loading BLS unemployment data for {year}...")
 
     # Read data from Google Sheets
-    df = pd.read_csv(BLS_DATA_URL, skiprows=1)
-    df = df.iloc[:, :9]
+    df = read_bls_sheet(year)
+    return prepare_bls_data(df, year)
+
+def prepare_bls_data(df, year=CENSUS_YEAR):
+    """
+    Prepare raw BLS sheet rows.
+
+    Args:
+        df: Raw BLS sheet as read from Google Sheets
+        year: Data year to keep
+
+    Returns:
+        pandas.DataFrame: Processed BLS data with FIPS codes and unemployment rates
+    """
+    df = df.iloc[:, :9].copy()
 
     # Rename columns
     df.columns = [
@@ -51,9 +155,9 @@ def load_bls_data():
         "LaborForce", "Employed", "Unemployed", "UnemploymentRate"
     ]
 
-    # Filter for 2022 and convert types
+    # Filter for the requested year and convert types
     df["Year"] = pd.to_numeric(df["Year"], errors="coerce")
-    df = df[df["Year"] == CENSUS_YEAR].copy()
+    df = df[df["Year"] == year].copy()
 
     numeric_cols = ["LaborForce", "Employed", "Unemployed", "UnemploymentRate"]
     for col in numeric_cols:
@@ -66,119 +170,150 @@ def load_bls_data():
 
     # Drop missing values and return final data
     df = df.dropna(subset=["UnemploymentRate", "FIPS"])
-    bls_final = df[["FIPS", "CountyName", "UnemploymentRate", "LaborForce"]].copy()
-    bls_final["FIPS"] = bls_final["FIPS"].astype(str)
+    bls_final = apply_schema(df[["FIPS", "UnemploymentRate"]], "BLS")
 
     print(f"BLS data loaded: {bls_final.shape[0]} counties")
     return bls_final
 
-def load_census_economic_data():
+def load_census_economic_data(year=CENSUS_YEAR, state_fips="*"):
     """
     Load census economic data including income, population, and poverty.
 
+    Args:
+        year: ACS 5-year estimate end year
+        state_fips: Two-digit state FIPS code, or '*' for all states
+
     Returns:
         pandas.DataFrame: Census economic data with calculated poverty rate
     """
-    print("Loading Census economic data...")
+    print(f"Loading Census economic data for {year}...")
 
     try:
         # Fetch data from Census API
-        econ = census_client.acs5.state_county(
-            fields=["NAME", "B19013_001E", "B01003_001E", "B17001_002E"],
-            state_fips="*",
-            county_fips="*",
-            year=CENSUS_YEAR,
-        )
-
-        # Convert to DataFrame and rename columns
-        econ_df = pd.DataFrame(econ)
-        econ_df = econ_df.rename(
-            columns={
-                "NAME": "County_Name",
-                "B19013_001E": "Median_Income",
-                "B01003_001E": "Population",
-                "B17001_002E": "Poverty_Count",
-            }
-        )
-
-        # Create FIPS code
-        econ_df["FIPS"] = (
-            econ_df["state"].astype(str).str.zfill(2) +
-            econ_df["county"].astype(str).str.zfill(3)
+        econ = census_rows(
+            lambda: get_census_client().acs5.state_county(
+                fields=CENSUS_ECONOMIC_FIELDS,
+                state_fips=state_fips,
+                county_fips="*",
+                year=year,
+            ),
+            CENSUS_ECONOMIC_FIELDS, year, state_fips
         )
-
-        # Convert to numeric and calculate poverty rate
-        econ_df["Median_Income"] = pd.to_numeric(econ_df["Median_Income"], errors="coerce")
-        econ_df["Population"] = pd.to_numeric(econ_df["Population"], errors="coerce")
-        econ_df["Poverty_Count"] = pd.to_numeric(econ_df["Poverty_Count"], errors="coerce")
-        econ_df["Poverty_Rate"] = (econ_df["Poverty_Count"] / econ_df["Population"]) * 100
-
-        # Return selected columns
-        return econ_df[["FIPS", "County_Name", "Median_Income", "Population", "Poverty_Rate"]]
+        return prepare_census_economic_data(econ)
 
     except Exception as e:
         print(f"Error loading economic data: {e}")
         return None
 
-def load_census_education_data():
+def prepare_census_economic_data(econ):
+    """
+    Prepare raw Census economic rows.
+
+    Args:
+        econ: Rows returned by the Census API, one dict per county
+
+    Returns:
+        pandas.DataFrame: Census economic data with calculated poverty rate
+    """
+    # Convert to DataFrame and rename columns
+    econ_df = pd.DataFrame(econ)
+    econ_df = econ_df.rename(
+        columns={
+            "NAME": "County_Name",
+            "B19013_001E": "Median_Income",
+            "B01003_001E": "Population",
+            "B17001_002E": "Poverty_Count",
+        }
+    )
+
+    # Create FIPS code
+    econ_df["FIPS"] = (
+        econ_df["state"].astype(str).str.zfill(2) +
+        econ_df["county"].astype(str).str.zfill(3)
+    )
+
+    # Convert to numeric and calculate poverty rate
+    econ_df["Median_Income"] = pd.to_numeric(econ_df["Median_Income"], errors="coerce")
+    econ_df["Population"] = pd.to_numeric(econ_df["Population"], errors="coerce")
+    econ_df["Poverty_Count"] = pd.to_numeric(econ_df["Poverty_Count"], errors="coerce")
+    econ_df["Poverty_Rate"] = (econ_df["Poverty_Count"] / econ_df["Population"]) * 100
+
+    # Return selected columns
+    return apply_schema(
+        econ_df[["FIPS", "Median_Income", "Population", "Poverty_Rate"]], "Census economic"
+    )
+
+def load_census_education_data(year=CENSUS_YEAR, state_fips="*"):
     """
     Load census education data for bachelor's degree and higher.
 
+    Args:
+        year: ACS 5-year estimate end year
+        state_fips: Two-digit state FIPS code, or '*' for all states
+
     Returns:
         pandas.DataFrame: Census education data with college educated percentage
     """
-    print("Loading Census education data...")
+    print(f"Loading Census education data for {year}...")
 
     try:
         # Fetch data from Census API
-        edu = census_client.acs5.state_county(
-            fields=[
-                "NAME", "B15003_022E", "B15003_023E", "B15003_024E",
-                "B15003_025E", "B15003_001E"
-            ],
-            state_fips="*",
-            county_fips="*",
-            year=CENSUS_YEAR,
-        )
-
-        # Convert to DataFrame and rename columns
-        edu_df = pd.DataFrame(edu)
-        edu_df = edu_df.rename(
-            columns={
-                "NAME": "County_Name",
-                "B15003_022E": "Bachelors",
-                "B15003_023E": "Masters",
-                "B15003_024E": "Professional",
-                "B15003_025E": "Doctorate",
-                "B15003_001E": "Total_Education",
-            }
-        )
-
-        # Create FIPS code
-        edu_df["FIPS"] = (
-            edu_df["state"].astype(str).str.zfill(2) +
-            edu_df["county"].astype(str).str.zfill(3)
+        edu = census_rows(
+            lambda: get_census_client().acs5.state_county(
+                fields=CENSUS_EDUCATION_FIELDS,
+                state_fips=state_fips,
+                county_fips="*",
+                year=year,
+            ),
+            CENSUS_EDUCATION_FIELDS, year, state_fips
         )
+        return prepare_census_education_data(edu)
 
-        # Convert to numeric
-        for col in ["Bachelors", "Masters", "Professional", "Doctorate", "Total_Education"]:
-            edu_df[col] = pd.to_numeric(edu_df[col], errors="coerce")
+    except Exception as e:
+        print(f"Error loading education data: {e}")
+        return None
 
-        # Calculate college educated percentage
-        edu_df["BachelorPlus"] = (
-            edu_df["Bachelors"] + edu_df["Masters"] +
-            edu_df["Professional"] + edu_df["Doctorate"]
-        )
-        edu_df["College_Educated_Pct"] = (
-            edu_df["BachelorPlus"] / edu_df["Total_Education"] * 100
-        )
+def prepare_census_education_data(edu):
+    """
+    Prepare raw Census education rows.
 
-        # Return selected columns
-        return edu_df[[
-            "FIPS", "Bachelors", "Masters", "Professional", "Doctorate",
-            "Total_Education", "BachelorPlus", "College_Educated_Pct"
-        ]]
+    Args:
+        edu: Rows returned by the Census API, one dict per county
 
-    except Exception as e:
-        print(f"Error loading education data: {e}")
-        return None
\ No newline at end of file
+    Returns:
+        pandas.DataFrame: Census education data with college educated percentage
+    """
+    # Convert to DataFrame and rename columns
+    edu_df = pd.DataFrame(edu)
+    edu_df = edu_df.rename(
+        columns={
+            "NAME": "County_Name",
+            "B15003_022E": "Bachelors",
+            "B15003_023E": "Masters",
+            "B15003_024E": "Professional",
+            "B15003_025E": "Doctorate",
+            "B15003_001E": "Total_Education",
+        }
+    )
+
+    # Create FIPS code
+    edu_df["FIPS"] = (
+        edu_df["state"].astype(str).str.zfill(2) +
+        edu_df["county"].astype(str).str.zfill(3)
+    )
+
+    # Convert to numeric
+    for col in ["Bachelors", "Masters", "Professional", "Doctorate", "Total_Education"]:
+        edu_df[col] = pd.to_numeric(edu_df[col], errors="coerce")
+
+    # Calculate college educated percentage
+    edu_df["BachelorPlus"] = (
+        edu_df["Bachelors"] + edu_df["Masters"] +
+        edu_df["Professional"] + edu_df["Doctorate"]
+    )
+    edu_df["College_Educated_Pct"] = (
+        edu_df["BachelorPlus"] / edu_df["Total_Education"] * 100
+    )
+
+    # Return selected columns
+    return apply_schema(edu_df[["FIPS", "College_Educated_Pct"]], "Census education")
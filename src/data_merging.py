@@ -2,8 +2,41 @@
 Data merging module for the project.
 Functions to merge all datasets into one final dataset.
 """
+import hashlib
 import pandas as pd
 
+from schema import apply_schema
+
+def dataset_fingerprint(merged_data):
+    """
+    Compute a content fingerprint of a dataset.
+
+    Args:
+        merged_data: Dataset to fingerprint
+
+    Returns:
+        str: Hex digest that changes whenever values, columns or row order change
+    """
+    row_hashes = pd.util.hash_pandas_object(merged_data, index=False).values
+    digest = hashlib.sha256(row_hashes.tobytes())
+    digest.update("|".join(map(str, merged_data.columns)).encode())
+    return digest.hexdigest()
+
+def merge_census_data(census_econ, census_edu):
+    """
+    Merge Census economic and education data.
+
+    Args:
+        census_econ: Census economic data
+        census_edu: Census education data
+
+    Returns:
+        pandas.DataFrame: Census data for counties present in both tables
+    """
+    census_merged = pd.merge(census_econ, census_edu, on="FIPS", how="inner")
+    print(f"Census data merged: {census_merged.shape[0]} counties")
+    return census_merged
+
 def merge_all_data(zillow_final, census_merged, bls_final):
     """
     Merge Zillow, Census, and BLS data into one comprehensive dataset.
@@ -36,6 +69,8 @@ def merge_all_data(zillow_final, census_merged, bls_final):
         )
         print(f"Added BLS data: {merged_data.shape[0]} counties")
 
+    merged_data = apply_schema(merged_data, "Merged")
+
     # Data quality information
     print(f"Final dataset: {merged_data.shape[0]} counties with complete data")
     print(f"Dataset shape: {merged_data.shape}")
@@ -0,0 +1,178 @@
+"""
+Source fixtures module for the project.
+Record and replay layer under the loaders in data_loading.py.
+
+In "live" mode sources are fetched from the network as before. In "record"
+mode the raw responses are also saved as gzip-compressed fixture files, and
+in "replay" mode the fixtures are served without network access or a Census
+API key. The mode and fixture directory come from config.py and can be
+overridden with the PIPELINE_SOURCE_MODE and PIPELINE_FIXTURE_DIR
+environment variables.
+"""
+import io
+import os
+import gzip
+import json
+import hashlib
+import urllib.request
+
+# Import from config
+from config import SOURCE_MODE, SOURCE_MODE_VAR, FIXTURE_DIR, FIXTURE_DIR_VAR
+
+SOURCE_MODES = ("live", "record", "replay")
+
+def source_mode():
+    """
+    Return the active source mode.
+
+    Returns:
+        str: 'live', 'record' or 'replay'
+    """
+    mode = os.getenv(SOURCE_MODE_VAR, SOURCE_MODE).lower()
+    if mode not in SOURCE_MODES:
+        raise ValueError(f"Unknown source mode '{mode}', expected one of {SOURCE_MODES}")
+    return mode
+
+def fixture_dir():
+    """
+    Return the directory fixtures are recorded to and replayed from.
+
+    Returns:
+        str: Fixture directory
+    """
+    return os.getenv(FIXTURE_DIR_VAR, FIXTURE_DIR)
+
+def _digest(text):
+    """Short stable hash used to tell fixtures of different requests apart."""
+    return hashlib.sha256(text.encode()).hexdigest()[:12]
+
+def url_fixture_name(prefix, url):
+    """
+    Return the fixture file name of a downloaded CSV.
+
+    Args:
+        prefix: Source name, e.g. 'zillow' or 'bls'
+        url: Source URL
+
+    Returns:
+        str: Fixture file name
+    """
+    return f"{prefix}_{_digest(url)}.csv.gz"
+
+def census_fixture_name(fields, year, state_fips="*"):
+    """
+    Return the fixture file name of a Census API request.
+
+    Args:
+        fields: Requested ACS fields
+        year: ACS 5-year estimate end year
+        state_fips: Two-digit state FIPS code, or '*' for all states
+
+    Returns:
+        str: Fixture file name
+    """
+    state = "all" if state_fips == "*" else state_fips
+    return f"census_acs5_{year}_{state}_{_digest(','.join(fields))}.json.gz"
+
+def _fixture_path(name):
+    """Return the path of a fixture, failing clearly when replaying a missing one."""
+    path = os.path.join(fixture_dir(), name)
+    if source_mode() == "replay" and not os.path.exists(path):
+        raise FileNotFoundError(
+            f"No recorded fixture '{path}'. Run once with {SOURCE_MODE_VAR}=record to create it"
+        )
+    return path
+
+def write_fixture(path, data):
+    """
+    Write raw response bytes as a gzip-compressed fixture.
+
+    The gzip header carries no timestamp, so identical responses give
+    identical files.
+
+    Args:
+        path: Fixture path
+        data: Raw response bytes
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        with gzip.GzipFile(filename="", mode="wb", fileobj=f, mtime=0) as gz:
+            gz.write(data)
+    os.replace(temp_path, path)
+
+def open_csv_source(url, prefix):
+    """
+    Return something pandas.read_csv can read for a CSV source.
+
+    Args:
+        url: Source URL
+        prefix: Source name used in the fixture file name
+
+    Returns:
+        str or io.BytesIO: The URL when live, the downloaded bytes when
+        recording, or the fixture path when replaying
+    """
+    mode = source_mode()
+    if mode == "live":
+        return url
+
+    path = _fixture_path(url_fixture_name(prefix, url))
+    if mode == "replay":
+        return path
+
+    with urllib.request.urlopen(url) as response:
+        data = response.read()
+    write_fixture(path, data)
+    print(f"Recorded {prefix} fixture: {path}")
+    return io.BytesIO(data)
+
+def read_json_fixture(path):
+    """
+    Read JSON rows from a fixture or plain JSON file.
+
+    Args:
+        path: File path; gzip-compressed when it ends with '.gz'
+
+    Returns:
+        list: Decoded rows
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt") as f:
+        return json.load(f)
+
+def write_json_fixture(path, rows):
+    """
+    Write JSON rows as a gzip-compressed fixture.
+
+    Args:
+        path: Fixture path
+        rows: JSON-serializable rows
+    """
+    write_fixture(path, json.dumps(rows).encode())
+
+def census_rows(fetch, fields, year, state_fips="*"):
+    """
+    Return Census API rows, recording or replaying them by request.
+
+    Args:
+        fetch: Function performing the live Census API request
+        fields: Requested ACS fields
+        year: ACS 5-year estimate end year
+        state_fips: Two-digit state FIPS code, or '*' for all states
+
+    Returns:
+        list: One dict per county as returned by the Census API
+    """
+    mode = source_mode()
+    if mode == "live":
+        return fetch()
+
+    path = _fixture_path(census_fixture_name(fields, year, state_fips))
+    if mode == "replay":
+        return read_json_fixture(path)
+
+    rows = fetch()
+    write_json_fixture(path, rows)
+    print(f"Recorded Census fixture: {path}")
+    return rows
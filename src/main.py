@@ -1,7 +1,18 @@
 """
 Main pipeline for the project.
 Runs the entire data processing pipeline from start to end.
+
+Usage:
+    python src/main.py
+    python src/main.py --outputs stats correlations --output-dir output
+    python src/main.py --sources zillow census --stages load clean merge --dry-run
+    python src/main.py --input final_merged_data.csv --outputs states --format parquet --quiet
 """
+import io
+import os
+import sys
+import argparse
+import contextlib
 import warnings
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -12,14 +23,148 @@ from config import *
 from data_loading import *
 from data_cleaning import *
 from data_merging import *
-from analysis import run_analysis
+from fixtures import source_mode
+from analysis import run_analysis, save_table, ANALYSIS_OUTPUTS, FRAME_OUTPUTS, OUTPUT_FORMATS
+from report import build_report
+
+# Sources and stages in execution order
+SOURCES = ["zillow", "census", "bls"]
+PIPELINE_STAGES = ["load", "clean", "merge", "analyze"]
+
+# Files written for each analysis output; tables take the selected format
+OUTPUT_FILES = {
+    "data": ["final_merged_data.{format}"],
+    "stats": ["descriptive_statistics.{format}"],
+    "correlations": ["correlation_matrix.{format}"],
+    "states": ["state_level_statistics.{format}"],
+    "figures": ["county_analysis_visualizations.png", "correlation_matrix.png"],
+    "summary": ["analysis_summary.txt"],
+    "report": [REPORT_FILE],
+}
+
+def validate_selection(sources=SOURCES, stages=PIPELINE_STAGES, outputs=ANALYSIS_OUTPUTS,
+                       input_path=None):
+    """
+    Check that a selection of sources, stages and outputs can run.
+
+    Args:
+        sources: Sources to load, from SOURCES
+        stages: Stages to run, from PIPELINE_STAGES
+        outputs: Analysis outputs to produce, from ANALYSIS_OUTPUTS
+        input_path: Saved merged dataset to analyze instead of loading sources
+
+    Raises:
+        ValueError: If the selection cannot run
+    """
+    if input_path:
+        if list(stages) != ["analyze"]:
+            raise ValueError("--input replaces the load, clean and merge stages; "
+                             "only the analyze stage can run on it")
+        return
+
+    ordered = [stage for stage in PIPELINE_STAGES if stage in stages]
+    if ordered != PIPELINE_STAGES[:len(ordered)]:
+        raise ValueError("Stages must start at 'load' and be consecutive; "
+                         "use --input to analyze a saved merged dataset")
+    if "zillow" not in sources:
+        raise ValueError("The zillow source is required: it provides MedianHomeValue")
+    if "figures" in outputs and "analyze" in stages and set(SOURCES) - set(sources):
+        raise ValueError("Figures plot every variable and need all sources")
+
+def queries_in_place(outputs, backend, input_path):
+    """
+    Tell whether a saved merged dataset can be analyzed without loading it.
+
+    DuckDB reads CSV and Parquet files directly, so statistics, correlations
+    and state rollups run out of core unless an output needs the whole dataset.
+
+    Args:
+        outputs: Analysis outputs to produce
+        backend: Analysis backend
+        input_path: Saved merged dataset, or None
+
+    Returns:
+        bool: True when input_path is passed to the analysis as is
+    """
+    return bool(input_path) and backend == "duckdb" and not input_path.endswith(".json") \
+        and not set(outputs) & set(FRAME_OUTPUTS)
+
+def plan_pipeline(sources=SOURCES, stages=PIPELINE_STAGES, outputs=ANALYSIS_OUTPUTS,
+                  output_dir=OUTPUT_DIR, file_format=OUTPUT_FORMAT,
+                  backend=ANALYSIS_BACKEND, input_path=None):
+    """
+    Describe the work a pipeline run would do, without doing it.
+
+    Args:
+        sources: Sources to load
+        stages: Stages to run
+        outputs: Analysis outputs to produce
+        output_dir: Directory results would be written to
+        file_format: File format of saved tables
+        backend: Analysis backend
+        input_path: Saved merged dataset to analyze instead of loading sources
 
-def run_pipeline():
+    Returns:
+        list: Lines describing the planned run
+    """
+    plan = []
+    if queries_in_place(outputs, backend, input_path):
+        plan.append(f"Query merged data in place from '{input_path}'")
+    elif input_path:
+        plan.append(f"Read merged data from '{input_path}'")
+    elif "load" in stages:
+        plan.append(f"Source mode: {source_mode()}")
+        source_urls = {
+            "zillow": ZILLOW_URL,
+            "census": f"Census API ACS 5-year {CENSUS_YEAR}",
+            "bls": bls_data_url(CENSUS_YEAR),
+        }
+        for source in SOURCES:
+            if source in sources:
+                plan.append(f"Load {source}: {source_urls[source]}")
+            else:
+                plan.append(f"Skip {source}")
+
+    for stage in PIPELINE_STAGES[1:]:
+        if stage in stages:
+            plan.append(f"Run stage: {stage}")
+
+    if "analyze" in stages:
+        plan.append(f"Analysis backend: {backend}")
+        files = [name for output in ANALYSIS_OUTPUTS if output in outputs
+                 for name in OUTPUT_FILES[output]]
+        if "figures" in outputs and "states" in outputs:
+            files.append("state_level_analysis.png")
+    elif "merge" in stages and "data" in outputs:
+        files = OUTPUT_FILES["data"]
+    else:
+        files = []
+
+    for name in files:
+        plan.append(f"Write {os.path.join(output_dir, name.format(format=file_format))}")
+    if not files:
+        plan.append("No files written")
+    return plan
+
+def run_pipeline(sources=SOURCES, stages=PIPELINE_STAGES, outputs=ANALYSIS_OUTPUTS,
+                 output_dir=OUTPUT_DIR, file_format=OUTPUT_FORMAT,
+                 backend=ANALYSIS_BACKEND, input_path=None):
     """
     Run the complete data processing pipeline.
 
+    Args:
+        sources: Sources to load, from SOURCES; skipped sources are left out of the merge
+        stages: Stages to run, from PIPELINE_STAGES; the run stops after the last one
+        outputs: Analysis outputs to produce, from ANALYSIS_OUTPUTS
+        output_dir: Directory to save figures and result files in
+        file_format: File format of saved tables
+        backend: 'pandas' or 'duckdb' for statistics, correlations and state rollups
+        input_path: Saved merged dataset to analyze instead of loading sources
+
     Returns:
-        pandas.DataFrame: Final merged dataset if successful, None otherwise
+        pandas.DataFrame: Final merged dataset if successful, or the Zillow data
+        when the run stops before merging; None otherwise. The input path is
+        returned when the duckdb backend analyzed it without loading it
     """
     print("STARTING DATA PROCESSING PIPELINE")
 
@@ -30,68 +175,97 @@ def run_pipeline():
     pd.set_option("display.max_columns", PD_DISPLAY_MAX_COLUMNS)
     print("Libraries imported and configured")
 
-    # Step 1: Load data
-    print("STEP 1: LOADING DATA")
+    if queries_in_place(outputs, backend, input_path):
+        merged_data = input_path
+    elif input_path:
+        try:
+            merged_data = load_merged_data(input_path)
+        except Exception as e:
+            print(f"Failed to load merged data: {e}")
+            return None
+    else:
+        # Step 1: Load data
+        print("STEP 1: LOADING DATA")
 
-    try:
-        zillow_df = load_zillow_data()
-        print(f"Zillow data sample:")
-        print(zillow_df[['RegionName', 'State', '2022-12-31']].head())
-    except Exception as e:
-        print(f"Failed to load Zillow data: {e}")
-        return None
+        try:
+            zillow_df = load_zillow_data()
+            print(f"Zillow data sample:")
+            print(zillow_df[['RegionName', 'State', '2022-12-31']].head())
+        except Exception as e:
+            print(f"Failed to load Zillow data: {e}")
+            return None
 
-    try:
-        bls_final = load_bls_data()
-        print(f"BLS data sample:")
-        print(bls_final.head())
-    except Exception as e:
-        print(f"Failed to load BLS data: {e}")
-        return None
+        bls_final = None
+        if "bls" in sources:
+            try:
+                bls_final = load_bls_data()
+                print(f"BLS data sample:")
+                print(bls_final.head())
+            except Exception as e:
+                print(f"Failed to load BLS data: {e}")
+                return None
 
-    try:
-        census_econ = load_census_economic_data()
-        census_edu = load_census_education_data()
-
-        if census_econ is not None and census_edu is not None:
-            census_merged = pd.merge(census_econ, census_edu, on="FIPS", how="inner")
-            print(f"Census data merged: {census_merged.shape[0]} counties")
-            print(f"Census data sample:")
-            print(census_merged.head())
-        else:
-            print("Failed to load Census data")
+        census_merged = None
+        if "census" in sources:
+            try:
+                census_econ = load_census_economic_data()
+                census_edu = load_census_education_data()
+
+                if census_econ is not None and census_edu is not None:
+                    census_merged = merge_census_data(census_econ, census_edu)
+                    print(f"Census data sample:")
+                    print(census_merged.head())
+                else:
+                    print("Failed to load Census data")
+                    return None
+            except Exception as e:
+                print(f"Failed to load Census data: {e}")
+                return None
+
+        if "clean" not in stages:
+            return zillow_df
+
+        # Step 2: Clean data
+        print("STEP 2: CLEANING DATA")
+
+        try:
+            zillow_final = clean_zillow_data(zillow_df)
+            print(f"Cleaned Zillow data sample:")
+            print(zillow_final.head())
+        except Exception as e:
+            print(f"Failed to clean Zillow data: {e}")
             return None
-    except Exception as e:
-        print(f"Failed to load Census data: {e}")
-        return None
 
-    # Step 2: Clean data
-    print("STEP 2: CLEANING DATA")
+        if "merge" not in stages:
+            return zillow_final
 
-    try:
-        zillow_final = clean_zillow_data(zillow_df)
-        print(f"Cleaned Zillow data sample:")
-        print(zillow_final.head())
-    except Exception as e:
-        print(f"Failed to clean Zillow data: {e}")
-        return None
+        # Step 3: Merge data
+        print("STEP 3: MERGING DATA")
 
-    # Step 3: Merge data
-    print("STEP 3: MERGING DATA")
+        try:
+            merged_data = merge_all_data(zillow_final, census_merged, bls_final)
+            print(f"Merged data sample:")
+            print(merged_data.head())
+        except Exception as e:
+            print(f"Failed to merge data: {e}")
+            return None
 
-    try:
-        merged_data = merge_all_data(zillow_final, census_merged, bls_final)
-        print(f"Merged data sample:")
-        print(merged_data.head())
-    except Exception as e:
-        print(f"Failed to merge data: {e}")
-        return None
+        if "analyze" not in stages:
+            if "data" in outputs:
+                os.makedirs(output_dir, exist_ok=True)
+                file_name = save_table(merged_data, output_dir, 'final_merged_data',
+                                       file_format, index=False)
+                print(f"Final dataset saved to '{file_name}'")
+            print("PIPELINE COMPLETED SUCCESSFULLY")
+            return merged_data
 
     # Step 4: Run analysis
     print("STEP 4: RUNNING ANALYSIS")
 
     try:
-        results = run_analysis(merged_data)
+        results = run_analysis(merged_data, output_dir, backend, outputs, file_format)
+        if "report" in outputs:
+            build_report(merged_data, output_dir=output_dir)
         print("Analysis completed successfully")
     except Exception as e:
         print(f"Analysis failed: {e}")
@@ -101,13 +275,62 @@ def run_pipeline():
 
     return merged_data
 
+def main(argv=None):
+    """
+    Run the pipeline from the command line.
+
+    Returns:
+        int: Exit code, 1 when the pipeline failed
+    """
+    parser = argparse.ArgumentParser(description="US county-level housing market analysis")
+    parser.add_argument("--sources", nargs="+", choices=SOURCES, default=SOURCES,
+                        help="Sources to load; skipped sources are left out of the merge")
+    parser.add_argument("--stages", nargs="+", choices=PIPELINE_STAGES,
+                        help="Stages to run (default: all, or analyze with --input)")
+    parser.add_argument("--outputs", nargs="+", choices=ANALYSIS_OUTPUTS,
+                        default=ANALYSIS_OUTPUTS, help="Analysis results to compute and save")
+    parser.add_argument("--input", help="Analyze a saved merged dataset instead of loading sources")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default=OUTPUT_FORMAT,
+                        help="File format of saved tables")
+    parser.add_argument("--backend", choices=["pandas", "duckdb"], default=ANALYSIS_BACKEND)
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Print the planned work without loading or writing anything")
+    parser.add_argument("--quiet", action="store_true",
+                        help="Print nothing unless the pipeline fails")
+    args = parser.parse_args(argv)
+
+    stages = args.stages or (["analyze"] if args.input else PIPELINE_STAGES)
+    try:
+        validate_selection(args.sources, stages, args.outputs, args.input)
+    except ValueError as e:
+        parser.error(str(e))
+
+    options = dict(sources=args.sources, stages=stages, outputs=args.outputs,
+                   output_dir=args.output_dir, file_format=args.format,
+                   backend=args.backend, input_path=args.input)
+
+    if args.dry_run:
+        print("PLANNED PIPELINE RUN")
+        for line in plan_pipeline(**options):
+            print(line)
+        return 0
+
+    if not args.quiet:
+        print("US COUNTY-LEVEL HOUSING MARKET ANALYSIS")
+        print("This pipeline will:")
+        for line in plan_pipeline(**options):
+            print(line)
+        return 0 if run_pipeline(**options) is not None else 1
+
+    # Keep the log and show it only when the run fails
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        result = run_pipeline(**options)
+    if result is None:
+        sys.stderr.write(log.getvalue())
+        return 1
+    return 0
+
 if __name__ == "__main__":
-    print("US COUNTY-LEVEL HOUSING MARKET ANALYSIS")
-    print("This pipeline will:")
-    print("1. Load data from Zillow, BLS, and Census API")
-    print("2. Clean and prepare the data")
-    print("3. Merge all datasets")
-    print("4. Perform statistical analysis")
-    print("5. Create visualizations")
-
-    result = run_pipeline()
+    sys.exit(main())
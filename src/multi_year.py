@@ -0,0 +1,233 @@
+"""
+Multi-year pipeline for the project.
+Fetches Census and BLS data for a range of years concurrently and runs the
+clean, merge and analysis stages for each year in a process pool.
+
+Usage:
+    python src/multi_year.py --start 2021 --end 2022
+    python src/multi_year.py --backend duckdb
+"""
+import os
+import argparse
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import matplotlib
+import pandas as pd
+
+# Import from local modules
+from config import (
+    MULTI_YEAR_START, MULTI_YEAR_END, MAX_WORKERS, OUTPUT_DIR, PANEL_DATA_FILE,
+    PANEL_STATE_STATISTICS_FILE, ZILLOW_KEY_COLUMNS, BLS_FILE_IDS, ANALYSIS_BACKEND
+)
+from data_loading import (
+    load_zillow_data, bls_data_url, read_bls_sheet, prepare_bls_data,
+    load_census_economic_data, load_census_education_data
+)
+from data_cleaning import clean_zillow_data
+from data_merging import merge_census_data, merge_all_data
+from analysis import run_analysis, STATE_COLUMNS
+from sql_backend import sql_group_statistics
+from schema import apply_schema
+
+def zillow_date_for_year(year):
+    """
+    Return the Zillow month-end column matching a data year.
+
+    Args:
+        year: Data year
+
+    Returns:
+        str: Month-end column name, e.g. '2022-12-31'
+    """
+    return f"{year}-12-31"
+
+def configured_years(years):
+    """
+    Keep the years that have a BLS sheet configured.
+
+    Args:
+        years: Requested data years
+
+    Returns:
+        list: Years with an entry in BLS_FILE_IDS
+    """
+    for year in years:
+        if year not in BLS_FILE_IDS:
+            print(f"No BLS sheet configured for {year} in BLS_FILE_IDS, skipping {year}")
+    return [year for year in years if year in BLS_FILE_IDS]
+
+def fetch_year_sources(years, max_workers=MAX_WORKERS):
+    """
+    Fetch Zillow, BLS and Census data for all years concurrently.
+
+    Zillow is fetched once since its wide file holds every month. Each BLS
+    sheet is fetched once and split by year; Census data is fetched per year.
+
+    Args:
+        years: Data years to fetch
+        max_workers: Maximum number of concurrent downloads
+
+    Returns:
+        tuple: Raw Zillow data and a dict of per-year (census_merged, bls_final)
+    """
+    years = configured_years(years)
+    if not years:
+        raise ValueError("None of the requested years has a BLS sheet configured in BLS_FILE_IDS")
+    print(f"Fetching sources for {len(years)} years...")
+
+    # Downloads are I/O bound, so threads overlap them without copying data
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        zillow_future = pool.submit(
+            load_zillow_data, [zillow_date_for_year(year) for year in years]
+        )
+
+        sheet_urls = sorted({bls_data_url(year) for year in years})
+        sheet_futures = {
+            url: pool.submit(read_bls_sheet, next(y for y in years if bls_data_url(y) == url))
+            for url in sheet_urls
+        }
+        econ_futures = {year: pool.submit(load_census_economic_data, year) for year in years}
+        edu_futures = {year: pool.submit(load_census_education_data, year) for year in years}
+
+        zillow_df = zillow_future.result()
+        sheets = {url: future.result() for url, future in sheet_futures.items()}
+
+        sources = {}
+        for year in years:
+            census_econ = econ_futures[year].result()
+            census_edu = edu_futures[year].result()
+            if census_econ is None or census_edu is None:
+                print(f"Failed to load Census data for {year}, skipping")
+                continue
+
+            census_merged = merge_census_data(census_econ, census_edu)
+            bls_final = prepare_bls_data(sheets[bls_data_url(year)], year)
+            sources[year] = (census_merged, bls_final)
+
+    return zillow_df, sources
+
+def run_year(year, zillow_year, census_merged, bls_final, output_dir=OUTPUT_DIR,
+             backend=ANALYSIS_BACKEND):
+    """
+    Clean, merge and analyze one year of data.
+
+    Args:
+        year: Data year
+        zillow_year: Zillow key columns and the year's month-end column
+        census_merged: Merged Census data for the year
+        bls_final: Processed BLS data for the year
+        output_dir: Parent directory of the per-year output directories
+        backend: 'pandas' or 'duckdb' for the year's analysis
+
+    Returns:
+        pandas.DataFrame: Merged data for the year with a Year column
+    """
+    # Workers only write figures to files
+    matplotlib.use("Agg")
+
+    print(f"PROCESSING {year}")
+    zillow_final = clean_zillow_data(zillow_year, zillow_date_for_year(year))
+    merged_data = merge_all_data(zillow_final, census_merged, bls_final)
+    if merged_data.empty:
+        raise ValueError(f"No counties with complete data for {year}")
+    run_analysis(merged_data, os.path.join(output_dir, str(year)), backend)
+
+    merged_data.insert(0, "Year", year)
+    return merged_data
+
+def panel_state_statistics(panel_path, backend=ANALYSIS_BACKEND):
+    """
+    Average the panel by year and state.
+
+    Args:
+        panel_path: Panel CSV or Parquet file written by run_multi_year_pipeline
+        backend: 'pandas' or 'duckdb'; DuckDB queries the file without loading it
+
+    Returns:
+        pandas.DataFrame: Year and state averages with county counts, sorted by
+        average home value
+    """
+    if backend == "duckdb":
+        return sql_group_statistics(panel_path, STATE_COLUMNS, group_by=("Year", "State"))
+
+    panel = pd.read_csv(panel_path, dtype={"FIPS": str})
+    columns = [col for col in STATE_COLUMNS if col in panel.columns]
+    state_stats = panel.groupby(["Year", "State"]).agg({
+        **{col: 'mean' for col in columns},
+        'FIPS': 'count'
+    }).rename(columns={'FIPS': 'CountyCount'})
+    return state_stats.sort_values('MedianHomeValue', ascending=False)
+
+def run_multi_year_pipeline(start_year=MULTI_YEAR_START, end_year=MULTI_YEAR_END,
+                            output_dir=OUTPUT_DIR, max_workers=MAX_WORKERS,
+                            backend=ANALYSIS_BACKEND):
+    """
+    Run the pipeline for every year in a range and build a long-format panel.
+
+    Args:
+        start_year: First data year
+        end_year: Last data year, inclusive
+        output_dir: Directory for the panel and the per-year output directories
+        max_workers: Maximum number of concurrent downloads and worker processes
+        backend: 'pandas' or 'duckdb' for the yearly analyses and the panel rollup
+
+    Returns:
+        pandas.DataFrame: Panel of merged data with one row per county and year
+    """
+    print(f"STARTING MULTI-YEAR PIPELINE: {start_year}-{end_year}")
+    years = list(range(start_year, end_year + 1))
+
+    zillow_df, sources = fetch_year_sources(years, max_workers)
+
+    # Keep only years whose month is present in the Zillow file
+    available = [
+        year for year in sources
+        if zillow_date_for_year(year) in zillow_df.columns
+    ]
+    for year in sorted(set(sources) - set(available)):
+        print(f"No Zillow values for {zillow_date_for_year(year)}, skipping {year}")
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            year: pool.submit(
+                run_year, year,
+                zillow_df[ZILLOW_KEY_COLUMNS + [zillow_date_for_year(year)]],
+                *sources[year], output_dir, backend
+            )
+            for year in available
+        }
+
+        yearly = []
+        for year in sorted(futures):
+            try:
+                yearly.append(futures[year].result())
+            except Exception as e:
+                print(f"Pipeline failed for {year}: {e}")
+
+    if not yearly:
+        print("No years completed")
+        return None
+
+    panel = apply_schema(pd.concat(yearly, ignore_index=True), "Panel")
+    os.makedirs(output_dir, exist_ok=True)
+    panel_path = os.path.join(output_dir, PANEL_DATA_FILE)
+    panel.to_csv(panel_path, index=False)
+    print(f"Panel saved to '{PANEL_DATA_FILE}': {panel.shape[0]} rows, "
+          f"{panel['Year'].nunique()} years")
+
+    state_stats = panel_state_statistics(panel_path, backend)
+    state_stats.to_csv(os.path.join(output_dir, PANEL_STATE_STATISTICS_FILE))
+    print(f"Year and state statistics saved to '{PANEL_STATE_STATISTICS_FILE}'")
+
+    return panel
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the pipeline for a range of years")
+    parser.add_argument("--start", type=int, default=MULTI_YEAR_START, help="First year")
+    parser.add_argument("--end", type=int, default=MULTI_YEAR_END, help="Last year")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    parser.add_argument("--backend", choices=["pandas", "duckdb"], default=ANALYSIS_BACKEND)
+    args = parser.parse_args()
+
+    run_multi_year_pipeline(args.start, args.end, args.output_dir, args.workers, args.backend)
@@ -0,0 +1,264 @@
+"""
+Query service module for the project.
+Local HTTP/JSON service serving lookups over the persisted merged dataset.
+"""
+import json
+import time
+import threading
+from collections import deque
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qsl
+
+import numpy as np
+import pandas as pd
+
+# Import from config
+from config import (
+    MERGED_DATA_FILE, QUERY_SERVICE_HOST, QUERY_SERVICE_PORT,
+    QUERY_CACHE_SIZE, QUERY_LATENCY_WINDOW
+)
+from data_loading import load_merged_data
+from schema import widen_floats
+from similarity import find_similar_counties
+
+# Columns averaged in state rollups, matching state_level_analysis
+ROLLUP_COLUMNS = [
+    'MedianHomeValue', 'Median_Income', 'Poverty_Rate',
+    'College_Educated_Pct', 'UnemploymentRate'
+]
+
+def _to_records(df):
+    """Convert a DataFrame to JSON-ready records with NaN as null."""
+    return json.loads(widen_floats(df).to_json(orient="records"))
+
+class CountyQueryService:
+    """
+    In-memory query engine over the merged dataset.
+
+    The dataset is loaded once and indexed by FIPS and state. Responses are
+    cached in an LRU cache keyed by path and query string.
+    """
+
+    def __init__(self, data_path=MERGED_DATA_FILE, cache_size=QUERY_CACHE_SIZE):
+        self.data_path = data_path
+        self.load(data_path)
+
+        self._respond = lru_cache(maxsize=cache_size)(self._dispatch)
+        self._lock = threading.Lock()
+        self._latencies = {}
+        self._counts = {}
+
+    def load(self, data_path):
+        """
+        Load the merged dataset and build the FIPS and state indexes.
+
+        Args:
+            data_path: CSV, Parquet or JSON file of the merged dataset written by the pipeline
+        """
+        self.data = load_merged_data(data_path).reset_index(drop=True)
+
+        self.fips_index = pd.Series(np.arange(len(self.data)), index=self.data["FIPS"])
+        self.state_index = {
+            state: np.asarray(positions)
+            for state, positions in self.data.groupby("State", observed=True).indices.items()
+        }
+        print(f"Query service ready: {len(self.data)} counties, {len(self.state_index)} states")
+
+    def handle(self, path, query=()):
+        """
+        Answer a request and record its latency.
+
+        Args:
+            path: Request path, e.g. '/county/06037'
+            query: Iterable of (name, value) query parameters
+
+        Returns:
+            tuple: HTTP status code and JSON-encoded response body
+        """
+        start = time.perf_counter()
+        endpoint = "/" + path.strip("/").split("/")[0]
+
+        if endpoint == "/metrics":
+            status, body = 200, json.dumps(self.metrics()).encode()
+        else:
+            status, body = self._respond(path.rstrip("/") or "/", tuple(sorted(query)))
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self._counts[endpoint] = self._counts.get(endpoint, 0) + 1
+            self._latencies.setdefault(endpoint, deque(maxlen=QUERY_LATENCY_WINDOW)).append(elapsed_ms)
+        return status, body
+
+    def metrics(self):
+        """
+        Summarize request counts, latencies and cache effectiveness.
+
+        Returns:
+            dict: Per-endpoint latency percentiles in milliseconds and cache statistics
+        """
+        with self._lock:
+            endpoints = {}
+            for endpoint, latencies in self._latencies.items():
+                values = np.array(latencies)
+                endpoints[endpoint] = {
+                    "requests": self._counts[endpoint],
+                    "mean_ms": round(float(values.mean()), 3),
+                    "p50_ms": round(float(np.percentile(values, 50)), 3),
+                    "p95_ms": round(float(np.percentile(values, 95)), 3),
+                    "max_ms": round(float(values.max()), 3),
+                }
+
+        cache = self._respond.cache_info()
+        return {
+            "endpoints": endpoints,
+            "cache": {
+                "hits": cache.hits,
+                "misses": cache.misses,
+                "size": cache.currsize,
+                "max_size": cache.maxsize,
+            },
+        }
+
+    def _dispatch(self, path, query):
+        """Route a request to its endpoint and encode the response."""
+        parts = path.strip("/").split("/")
+        params = dict(query)
+        routes = {
+            "county": self.county,
+            "counties": self.counties,
+            "top": self.top,
+            "states": self.states,
+            "similar": self.similar,
+        }
+
+        try:
+            if parts[0] == "":
+                payload = {"endpoints": ["/county/<fips>", "/counties", "/top",
+                                         "/states", "/states/<state>",
+                                         "/similar/<fips>", "/metrics"]}
+            elif parts[0] in routes:
+                payload = routes[parts[0]](*parts[1:], **params)
+            else:
+                raise KeyError(f"Unknown endpoint '/{parts[0]}'")
+            status = 200
+        except KeyError as e:
+            status, payload = 404, {"error": e.args[0]}
+        except (TypeError, ValueError) as e:
+            status, payload = 400, {"error": str(e)}
+
+        return status, json.dumps(payload).encode()
+
+    def _rows(self, state=None):
+        """Return all rows, or the rows of one state via the state index."""
+        if state is None:
+            return self.data
+        if state not in self.state_index:
+            raise KeyError(f"State '{state}' not found")
+        return self.data.iloc[self.state_index[state]]
+
+    def _check_column(self, column):
+        """Ensure a numeric column exists in the dataset."""
+        if column not in self.data.columns or not pd.api.types.is_numeric_dtype(self.data[column]):
+            raise ValueError(f"'{column}' is not a numeric column")
+
+    def county(self, fips):
+        """Look up a single county by FIPS code."""
+        if fips not in self.fips_index.index:
+            raise KeyError(f"County '{fips}' not found")
+        return _to_records(self.data.iloc[[self.fips_index[fips]]])[0]
+
+    def counties(self, state=None, limit=None, **filters):
+        """
+        Filter counties by state and numeric ranges.
+
+        Range filters are given as min_<column> and max_<column> parameters.
+        """
+        rows = self._rows(state)
+        mask = np.ones(len(rows), dtype=bool)
+
+        for name, value in filters.items():
+            bound, _, column = name.partition("_")
+            if bound not in ("min", "max") or not column:
+                raise ValueError(f"Unknown filter '{name}'")
+            self._check_column(column)
+            values = rows[column].to_numpy(dtype=float, na_value=np.nan)
+            mask &= values >= float(value) if bound == "min" else values <= float(value)
+
+        result = rows[mask]
+        if limit is not None:
+            result = result.head(int(limit))
+        return {"count": int(mask.sum()), "counties": _to_records(result)}
+
+    def top(self, column="MedianHomeValue", n="10", state=None, ascending="false"):
+        """Return the top (or bottom) N counties by a numeric column."""
+        self._check_column(column)
+        rows = self._rows(state)
+        if ascending.lower() == "true":
+            result = rows.nsmallest(int(n), column)
+        else:
+            result = rows.nlargest(int(n), column)
+        return _to_records(result)
+
+    def states(self, state=None):
+        """Return state-level averages and county counts."""
+        rows = self._rows(state)
+        columns = [col for col in ROLLUP_COLUMNS if col in rows.columns]
+        state_stats = rows.groupby("State", observed=True).agg(
+            {**{col: "mean" for col in columns}, "FIPS": "count"}
+        ).rename(columns={"FIPS": "CountyCount"})
+        state_stats = state_stats.sort_values("MedianHomeValue", ascending=False)
+        return _to_records(state_stats.reset_index())
+
+    def similar(self, fips, k="5"):
+        """Return the counties most similar to a county."""
+        if fips not in self.fips_index.index:
+            raise KeyError(f"County '{fips}' not found")
+        return _to_records(find_similar_counties(self.data, [fips], k=int(k)))
+
+class _QueryRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler forwarding GET requests to the query service."""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        status, body = self.server.service.handle(url.path, parse_qsl(url.query))
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def serve(data_path=MERGED_DATA_FILE, host=QUERY_SERVICE_HOST, port=QUERY_SERVICE_PORT):
+    """
+    Start the query service and block until interrupted.
+
+    Args:
+        data_path: Path to the merged dataset CSV written by the pipeline
+        host: Interface to bind
+        port: Port to listen on
+    """
+    server = ThreadingHTTPServer((host, port), _QueryRequestHandler)
+    server.service = CountyQueryService(data_path)
+
+    print(f"Serving county queries on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Query service stopped")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve the merged county dataset over HTTP/JSON")
+    parser.add_argument("--data", default=MERGED_DATA_FILE, help="Merged dataset CSV")
+    parser.add_argument("--host", default=QUERY_SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=QUERY_SERVICE_PORT)
+    args = parser.parse_args()
+
+    serve(args.data, args.host, args.port)
@@ -0,0 +1,251 @@
+"""
+Report module for the project.
+Builds a single self-contained HTML report of the analysis results.
+
+Each section is cached under a hash of the data it is built from, so a rerun
+only renders the sections whose inputs changed. Figures are embedded as
+base64 PNG images.
+
+Usage:
+    python src/report.py --input final_merged_data.csv
+    python src/report.py --input final_merged_data.csv --extra clusters=county_clusters.csv
+"""
+import io
+import os
+import re
+import glob
+import html
+import base64
+import hashlib
+import argparse
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+# Import from local modules
+from config import OUTPUT_DIR, REPORT_FILE, REPORT_CACHE_DIR, REPORT_FIGURE_DPI, MERGED_DATA_FILE
+from data_loading import load_merged_data
+from data_merging import dataset_fingerprint
+from analysis import (
+    STATE_COLUMNS, KEY_STATISTICS, compute_state_statistics, county_overview_figure,
+    correlation_heatmap_figure, state_statistics_figure
+)
+
+# Bump to invalidate cached sections after changing how sections are rendered
+REPORT_VERSION = 1
+
+# Optional results rendered after the core sections when present
+EXTRA_SECTIONS = {
+    "clusters": "Clustering",
+    "outliers": "Outliers",
+    "regression": "Regression",
+}
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>US County-Level Housing Market Analysis</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em auto; max-width: 1100px; color: #222; }}
+table {{ border-collapse: collapse; margin: 1em 0; font-size: 0.9em; }}
+th, td {{ padding: 4px 10px; border-bottom: 1px solid #ddd; text-align: right; }}
+th {{ background: #f4f4f4; }}
+img {{ max-width: 100%; }}
+nav li {{ display: inline; margin-right: 1em; }}
+</style>
+</head>
+<body>
+<h1>US County-Level Housing Market Analysis</h1>
+<nav><ul>
+{toc}
+</ul></nav>
+{sections}
+</body>
+</html>
+"""
+
+def _slug(name):
+    """Turn a section name into a file and anchor safe identifier."""
+    return re.sub(r"[^A-Za-z0-9_]+", "_", name)
+
+def _table_html(df):
+    """Render a DataFrame as an HTML table."""
+    return df.to_html(border=0, float_format=lambda value: f"{value:,.3f}")
+
+def _figure_html(fig, alt):
+    """Render a figure as an embedded PNG image."""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=REPORT_FIGURE_DPI, bbox_inches="tight")
+    plt.close(fig)
+    encoded = base64.b64encode(buffer.getvalue()).decode()
+    return f'<img alt="{html.escape(alt)}" src="data:image/png;base64,{encoded}">'
+
+def _overview_html(data):
+    """Render the county count and the averages of the key variables."""
+    items = [f"<li>Total counties analyzed: {len(data)}</li>"]
+    for label, _, column, fmt in KEY_STATISTICS[1:]:
+        if column in data.columns:
+            items.append(f"<li>{label}: {html.escape(fmt.format(data[column].mean()))}</li>")
+    return "<ul>\n" + "\n".join(items) + "\n</ul>"
+
+def _correlations_html(data):
+    """Render the correlation matrix, its heatmap and the home value correlations."""
+    correlation_matrix = data.corr()
+    home_value_corr = correlation_matrix['MedianHomeValue'].drop('MedianHomeValue')
+    top = home_value_corr.sort_values(ascending=False).to_frame("Correlation with home value")
+    return "\n".join([
+        _table_html(correlation_matrix),
+        _table_html(top),
+        _figure_html(correlation_heatmap_figure(correlation_matrix), "Correlation heatmap"),
+    ])
+
+def _states_html(data):
+    """Render the state rollup table and the top states chart."""
+    state_stats = compute_state_statistics(data)
+    return "\n".join([
+        _table_html(state_stats),
+        _figure_html(state_statistics_figure(state_stats), "Top states by home value"),
+    ])
+
+def _county_figures_html(data):
+    """Render the county-level distribution and scatter panels."""
+    return _figure_html(county_overview_figure(data), "County-level analysis")
+
+def report_sections(merged_data, extra_results=None):
+    """
+    List the report sections with the data each one is built from.
+
+    Args:
+        merged_data: Final merged dataset
+        extra_results: Optional result tables keyed by name, such as 'clusters',
+            'outliers' or 'regression'
+
+    Returns:
+        list: (name, title, input data, render function) tuples in report order
+    """
+    key_columns = [col for col in STATE_COLUMNS if col in merged_data.columns]
+    numeric = merged_data.select_dtypes(include=[np.number])
+
+    sections = [
+        ("overview", "Overview", merged_data[key_columns], _overview_html),
+        ("statistics", "Descriptive Statistics", numeric,
+         lambda data: _table_html(data.describe())),
+        ("correlations", "Correlations", merged_data[key_columns], _correlations_html),
+        ("states", "State Rollups", merged_data[["State", "FIPS"] + key_columns], _states_html),
+    ]
+
+    # The county panels plot every key variable
+    if key_columns == STATE_COLUMNS:
+        sections.append(("figures", "County Figures",
+                         merged_data[["County"] + key_columns], _county_figures_html))
+
+    extra_results = extra_results or {}
+    names = [name for name in EXTRA_SECTIONS if name in extra_results]
+    names += [name for name in extra_results if name not in EXTRA_SECTIONS]
+    for name in names:
+        title = EXTRA_SECTIONS.get(name, name.replace("_", " ").title())
+        sections.append((name, title, extra_results[name], _table_html))
+
+    return sections
+
+def section_key(name, data):
+    """
+    Hash a section's name, renderer version and input data.
+
+    Args:
+        name: Section name
+        data: DataFrame the section is built from
+
+    Returns:
+        str: Hex digest identifying the rendered section
+    """
+    digest = hashlib.sha256(f"{name}|{REPORT_VERSION}|".encode())
+    digest.update(dataset_fingerprint(data.reset_index()).encode())
+    return digest.hexdigest()
+
+def render_section(name, title, data, render, cache_dir):
+    """
+    Return a section's HTML, rendering it only when its cached copy is stale.
+
+    Args:
+        name: Section name
+        title: Section heading
+        data: DataFrame the section is built from
+        render: Function turning the data into the section body
+        cache_dir: Directory of cached sections
+
+    Returns:
+        tuple: Section HTML and whether it was rendered in this call
+    """
+    slug = _slug(name)
+    path = os.path.join(cache_dir, f"{slug}-{section_key(name, data)[:16]}.html")
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return f.read(), False
+
+    body = render(data)
+    section = f'<section id="{slug}">\n<h2>{html.escape(title)}</h2>\n{body}\n</section>'
+
+    # Older renders of this section can never be hit again
+    for stale in glob.glob(os.path.join(cache_dir, f"{slug}-*.html")):
+        os.remove(stale)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(section)
+    return section, True
+
+def build_report(merged_data, extra_results=None, output_dir=OUTPUT_DIR, cache_dir=None):
+    """
+    Build the HTML report, re-rendering only sections whose data changed.
+
+    Args:
+        merged_data: Final merged dataset
+        extra_results: Optional result tables keyed by name, such as 'clusters',
+            'outliers' or 'regression'
+        output_dir: Directory to save the report in
+        cache_dir: Directory of cached sections; REPORT_CACHE_DIR inside
+            output_dir when None
+
+    Returns:
+        dict: Report path and the names of the rendered and cached sections
+    """
+    print("BUILDING HTML REPORT")
+    cache_dir = cache_dir or os.path.join(output_dir, REPORT_CACHE_DIR)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    toc = []
+    sections = []
+    rendered = []
+    cached = []
+    for name, title, data, render in report_sections(merged_data, extra_results):
+        section, was_rendered = render_section(name, title, data, render, cache_dir)
+        (rendered if was_rendered else cached).append(name)
+        sections.append(section)
+        toc.append(f'<li><a href="#{_slug(name)}">{html.escape(title)}</a></li>')
+
+    path = os.path.join(output_dir, REPORT_FILE)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(PAGE_TEMPLATE.format(toc="\n".join(toc), sections="\n".join(sections)))
+
+    print(f"Report saved to '{REPORT_FILE}': {len(rendered)} sections rendered, "
+          f"{len(cached)} reused from cache")
+    return {"path": path, "rendered": rendered, "cached": cached}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the HTML analysis report")
+    parser.add_argument("--input", default=MERGED_DATA_FILE, help="Saved merged dataset")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--cache-dir", help="Section cache directory")
+    parser.add_argument("--extra", nargs="+", default=[], metavar="NAME=PATH",
+                        help="Extra result tables, e.g. clusters=county_clusters.csv")
+    args = parser.parse_args()
+
+    extra_results = {}
+    for item in args.extra:
+        name, _, path = item.partition("=")
+        if not path:
+            parser.error(f"--extra expects NAME=PATH, got '{item}'")
+        extra_results[name] = pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path)
+
+    build_report(load_merged_data(args.input), extra_results, args.output_dir, args.cache_dir)
@@ -0,0 +1,118 @@
+"""
+Schema module for the project.
+Central column dtypes and valid ranges applied by every loader and merge.
+"""
+import numpy as np
+import pandas as pd
+
+# Column dtypes and valid value ranges; None means unbounded
+COLUMN_SCHEMA = {
+    "FIPS": {"dtype": "object", "nullable": False},
+    "Year": {"dtype": "Int16", "min": 1900, "max": 2100},
+    "County": {"dtype": "category"},
+    "State": {"dtype": "category"},
+    "MedianHomeValue": {"dtype": "float32", "min": 0, "max": None},
+    "Median_Income": {"dtype": "float32", "min": 0, "max": None},
+    "Population": {"dtype": "Int32", "min": 0, "max": None},
+    "Poverty_Rate": {"dtype": "float32", "min": 0, "max": 100},
+    "College_Educated_Pct": {"dtype": "float32", "min": 0, "max": 100},
+    "UnemploymentRate": {"dtype": "float32", "min": 0, "max": 100},
+}
+
+def apply_schema(df, stage):
+    """
+    Convert columns to their schema dtypes, validate them and report memory.
+
+    Columns not in the schema are left unchanged.
+
+    Args:
+        df: DataFrame produced by a pipeline stage
+        stage: Stage name used in the printed report
+
+    Returns:
+        pandas.DataFrame: DataFrame with schema dtypes
+    """
+    df = df.copy()
+    for column in df.columns.intersection(list(COLUMN_SCHEMA)):
+        dtype = COLUMN_SCHEMA[column]["dtype"]
+        if dtype in ("Int16", "Int32"):
+            # Nullable integers need whole numbers, so round measured counts first
+            df[column] = pd.to_numeric(df[column], errors="coerce").round().astype(dtype)
+        elif dtype == "object":
+            # Keep missing codes missing so the nullable rule can report them
+            df[column] = df[column].astype(str).where(df[column].notna())
+        else:
+            df[column] = df[column].astype(dtype)
+
+    validate_frame(df, stage)
+    report_memory(df, stage)
+    return df
+
+def validate_frame(df, stage):
+    """
+    Check schema columns for nulls in required columns and out-of-range values.
+
+    Args:
+        df: DataFrame to validate
+        stage: Stage name used in the printed report
+
+    Returns:
+        pandas.DataFrame: Issue counts per column, empty when the frame is valid
+    """
+    issues = {}
+    for column in df.columns.intersection(list(COLUMN_SCHEMA)):
+        rules = COLUMN_SCHEMA[column]
+        nulls = int(df[column].isna().sum())
+        below = above = 0
+
+        if "min" in rules:
+            values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            if rules["min"] is not None:
+                below = int(np.count_nonzero(values < rules["min"]))
+            if rules["max"] is not None:
+                above = int(np.count_nonzero(values > rules["max"]))
+
+        required_nulls = nulls if rules.get("nullable", True) is False else 0
+        if required_nulls or below or above:
+            issues[column] = {"nulls": required_nulls, "below_min": below, "above_max": above}
+
+    issues = pd.DataFrame.from_dict(issues, orient="index",
+                                    columns=["nulls", "below_min", "above_max"])
+    if not issues.empty:
+        print(f"Schema validation issues in {stage} data:")
+        print(issues)
+    return issues
+
+def report_memory(df, stage):
+    """
+    Print and return the in-memory size of a DataFrame.
+
+    Args:
+        df: DataFrame to measure
+        stage: Stage name used in the printed report
+
+    Returns:
+        float: Deep memory usage in MB
+    """
+    memory_mb = df.memory_usage(deep=True).sum() / 1024 ** 2
+    print(f"{stage} data memory: {memory_mb:.2f} MB ({df.shape[0]} rows, {df.shape[1]} columns)")
+    return memory_mb
+
+def widen_floats(df):
+    """
+    Convert float32 columns to float64 for text output such as JSON.
+
+    Values go through their shortest float32 decimal form, so 4.4 is written
+    as 4.4 rather than 4.4000000954.
+
+    Args:
+        df: DataFrame to convert
+
+    Returns:
+        pandas.DataFrame: Copy with float64 columns in place of float32 ones
+    """
+    float32_columns = df.select_dtypes(include=[np.float32]).columns
+    if float32_columns.empty:
+        return df
+    return df.astype({col: str for col in float32_columns}).astype(
+        {col: "float64" for col in float32_columns})
@@ -0,0 +1,246 @@
+"""
+Sharded pipeline for the project.
+Runs loading, cleaning, merging and the per-state analysis for each state in
+a process pool, passing data between processes through shared memory.
+
+Usage:
+    python src/sharded.py --output-dir output --workers 8
+"""
+import os
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+# Import from local modules
+from config import CENSUS_YEAR, LATEST_DATE, MAX_WORKERS, OUTPUT_DIR
+from data_loading import (
+    load_zillow_data, load_bls_data,
+    load_census_economic_data, load_census_education_data
+)
+from data_cleaning import clean_zillow_data
+from data_merging import merge_census_data, merge_all_data
+from schema import apply_schema
+from analysis import (
+    basic_descriptive_statistics, correlation_analysis, create_visualizations,
+    compute_state_statistics, plot_state_statistics, save_analysis_results
+)
+
+def share_frame(df):
+    """
+    Copy a DataFrame into one shared memory block.
+
+    Numeric columns are stored as raw arrays, nullable integers as values plus
+    a mask, categoricals as codes with their categories in the handle, and
+    string columns as fixed-width unicode arrays plus a mask of missing values.
+
+    Args:
+        df: DataFrame to share
+
+    Returns:
+        dict: Small picklable handle describing the block and its columns
+    """
+    arrays = []
+    columns = []
+    for name in df.columns:
+        series = df[name]
+        dtype = series.dtype
+
+        if isinstance(dtype, pd.CategoricalDtype):
+            arrays.append(series.cat.codes.to_numpy())
+            columns.append((name, "category", list(dtype.categories)))
+        elif isinstance(dtype, pd.api.extensions.ExtensionDtype):
+            arrays.append(series.to_numpy(dtype=dtype.numpy_dtype, na_value=0))
+            arrays.append(series.isna().to_numpy())
+            columns.append((name, "masked", str(dtype)))
+        elif dtype == object:
+            missing = series.isna().to_numpy()
+            arrays.append(series.where(~missing, "").astype(str).to_numpy(dtype=str))
+            arrays.append(missing)
+            columns.append((name, "string", None))
+        else:
+            arrays.append(series.to_numpy())
+            columns.append((name, "numeric", None))
+
+    layout = []
+    offset = 0
+    for array in arrays:
+        layout.append((array.dtype.str, array.shape, offset))
+        offset += array.nbytes
+
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for array, (_, _, start) in zip(arrays, layout):
+        shm.buf[start:start + array.nbytes] = array.tobytes()
+    shm.close()
+
+    return {"name": shm.name, "columns": columns, "layout": layout}
+
+def attach_frame(handle):
+    """
+    Rebuild a DataFrame from a shared memory block.
+
+    Args:
+        handle: Handle returned by share_frame
+
+    Returns:
+        pandas.DataFrame: Copy of the shared DataFrame
+    """
+    shm = shared_memory.SharedMemory(name=handle["name"])
+    try:
+        arrays = iter([
+            np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset).copy()
+            for dtype, shape, offset in handle["layout"]
+        ])
+
+        data = {}
+        for name, kind, extra in handle["columns"]:
+            values = next(arrays)
+            if kind == "category":
+                data[name] = pd.Categorical.from_codes(values, categories=extra)
+            elif kind == "masked":
+                column = pd.array(values, dtype=extra)
+                column[next(arrays)] = pd.NA
+                data[name] = column
+            elif kind == "string":
+                column = values.astype(object)
+                column[next(arrays)] = None
+                data[name] = column
+            else:
+                data[name] = values
+    finally:
+        shm.close()
+
+    return pd.DataFrame(data)
+
+def release_frame(handle):
+    """
+    Free a shared memory block.
+
+    Args:
+        handle: Handle returned by share_frame
+    """
+    shm = shared_memory.SharedMemory(name=handle["name"])
+    shm.close()
+    shm.unlink()
+
+def process_state_shard(state_fips, zillow_handle, bls_handle, year=CENSUS_YEAR,
+                        date_column=LATEST_DATE):
+    """
+    Load, clean and merge one state and compute its state-level statistics.
+
+    Args:
+        state_fips: Two-digit state FIPS code
+        zillow_handle: Shared raw Zillow rows of the state
+        bls_handle: Shared BLS rows of the state
+        year: Census data year
+        date_column: Zillow month-end column to use
+
+    Returns:
+        tuple: Handle of the shared merged rows and the state's statistics, or
+        None when the state has no complete counties
+    """
+    # Census data is requested for this state only
+    census_econ = load_census_economic_data(year, state_fips)
+    census_edu = load_census_education_data(year, state_fips)
+    if census_econ is None or census_edu is None:
+        raise ValueError(f"Failed to load Census data for state {state_fips}")
+
+    census_merged = merge_census_data(census_econ, census_edu)
+    zillow_final = clean_zillow_data(attach_frame(zillow_handle), date_column)
+    merged_shard = merge_all_data(zillow_final, census_merged, attach_frame(bls_handle))
+
+    if merged_shard.empty:
+        return None
+    return share_frame(merged_shard), compute_state_statistics(merged_shard)
+
+def run_sharded_pipeline(output_dir=OUTPUT_DIR, max_workers=MAX_WORKERS,
+                         year=CENSUS_YEAR, date_column=LATEST_DATE):
+    """
+    Run the pipeline with one shard per state and reduce to national outputs.
+
+    Zillow and BLS are national files, so they are downloaded once and split
+    by state FIPS. Census loading, cleaning, merging and the state-level
+    statistics run per state in the process pool. The national statistics,
+    correlations and figures are computed on the reduced dataset.
+
+    Args:
+        output_dir: Directory to save figures and result files in
+        max_workers: Maximum number of worker processes
+        year: Census data year
+        date_column: Zillow month-end column to use
+
+    Returns:
+        dict: Merged dataset and analysis results, or None if nothing merged
+    """
+    print("STARTING SHARDED PIPELINE")
+
+    zillow_df = load_zillow_data([date_column])
+    bls_final = load_bls_data(year)
+
+    # Split the national files by state FIPS
+    zillow_states = zillow_df["StateCodeFIPS"].astype(int).astype(str).str.zfill(2)
+    bls_states = bls_final["FIPS"].str[:2]
+    states = sorted(set(zillow_states) & set(bls_states))
+    print(f"Sharding {len(states)} states across {max_workers or os.cpu_count()} workers")
+
+    input_handles = []
+    merged_handles = []
+    state_rows = []
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {}
+            for state in states:
+                zillow_handle = share_frame(zillow_df[zillow_states == state])
+                bls_handle = share_frame(bls_final[bls_states == state])
+                input_handles += [zillow_handle, bls_handle]
+                futures[state] = pool.submit(
+                    process_state_shard, state, zillow_handle, bls_handle, year, date_column
+                )
+
+            for state in states:
+                try:
+                    result = futures[state].result()
+                except Exception as e:
+                    print(f"Shard failed for state {state}: {e}")
+                    continue
+                if result is not None:
+                    merged_handles.append(result[0])
+                    state_rows.append(result[1])
+
+        if not merged_handles:
+            print("No shards produced merged data")
+            return None
+
+        # Reduce the shards into the national dataset
+        shards = [attach_frame(handle) for handle in merged_handles]
+    finally:
+        for handle in input_handles + merged_handles:
+            release_frame(handle)
+
+    merged_data = apply_schema(pd.concat(shards, ignore_index=True), "Merged")
+    state_stats = pd.concat(state_rows).sort_values('MedianHomeValue', ascending=False)
+
+    os.makedirs(output_dir, exist_ok=True)
+    stats = basic_descriptive_statistics(merged_data)
+    correlation_matrix = correlation_analysis(merged_data)
+    create_visualizations(merged_data, output_dir)
+    plot_state_statistics(state_stats, output_dir)
+    save_analysis_results(merged_data, stats, correlation_matrix, state_stats, output_dir)
+
+    print("SHARDED PIPELINE COMPLETED SUCCESSFULLY")
+    return {
+        "merged_data": merged_data,
+        "stats": stats,
+        "correlation_matrix": correlation_matrix,
+        "state_stats": state_stats,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the pipeline sharded by state")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    args = parser.parse_args()
+
+    run_sharded_pipeline(args.output_dir, args.workers)
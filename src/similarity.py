@@ -0,0 +1,181 @@
+"""
+Similarity module for the project.
+Functions to find comparable counties using a KD-tree over standardized features.
+"""
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+# Import from config
+from config import SIMILARITY_FEATURES, SIMILARITY_NEIGHBORS, SIMILARITY_TOP_FEATURES
+from data_merging import dataset_fingerprint
+
+# Built indexes keyed by dataset fingerprint
+_INDEX_CACHE = {}
+
+def build_similarity_index(merged_data, features=SIMILARITY_FEATURES):
+    """
+    Build a KD-tree over the standardized socio-economic features.
+
+    Args:
+        merged_data: Final merged dataset
+        features: Feature columns to standardize and index
+
+    Returns:
+        dict: KD-tree, FIPS codes, standardized matrix and scaling parameters
+    """
+    print("Building county similarity index...")
+
+    # Keep counties with complete feature values
+    complete = merged_data.dropna(subset=list(features))
+    values = complete[list(features)].to_numpy(dtype=np.float64)
+
+    # Standardize features so each one contributes on the same scale
+    mean = values.mean(axis=0)
+    std = values.std(axis=0)
+    std[std == 0] = 1.0
+    scaled = (values - mean) / std
+
+    fips = complete["FIPS"].astype(str).to_numpy()
+
+    print(f"Similarity index built: {len(fips)} counties, {len(features)} features")
+    return {
+        "tree": cKDTree(scaled),
+        "fips": fips,
+        "position": pd.Series(np.arange(len(fips)), index=fips),
+        "scaled": scaled,
+        "features": list(features),
+        "mean": mean,
+        "std": std,
+    }
+
+def get_similarity_index(merged_data, features=SIMILARITY_FEATURES):
+    """
+    Return the similarity index, rebuilding it only when the dataset changes.
+
+    Args:
+        merged_data: Final merged dataset
+        features: Feature columns to standardize and index
+
+    Returns:
+        dict: Similarity index as returned by build_similarity_index
+    """
+    key = (dataset_fingerprint(merged_data), tuple(features))
+    if key not in _INDEX_CACHE:
+        _INDEX_CACHE.clear()
+        _INDEX_CACHE[key] = build_similarity_index(merged_data, features)
+    return _INDEX_CACHE[key]
+
+def _query_positions(index, fips_codes):
+    """Map FIPS codes to row positions in the index, dropping unknown codes."""
+    if fips_codes is None:
+        return np.arange(len(index["fips"]))
+
+    fips_codes = pd.Index([str(code) for code in fips_codes])
+    known = fips_codes.isin(index["position"].index)
+    if not known.all():
+        print(f"Skipping FIPS codes not in similarity index: {list(fips_codes[~known])}")
+    return index["position"].loc[fips_codes[known]].to_numpy()
+
+def _top_features(index, query_pos, neighbor_pos, top_n):
+    """Name the features contributing most to each query-neighbor distance."""
+    diffs = index["scaled"][query_pos] - index["scaled"][neighbor_pos]
+    contributions = diffs ** 2
+    order = np.argsort(-contributions, axis=1)[:, :top_n]
+
+    # Label each distinct feature ranking once instead of once per row
+    n_features = len(index["features"])
+    codes = order @ (n_features ** np.arange(order.shape[1]))
+    _, first_row, inverse = np.unique(codes, return_index=True, return_inverse=True)
+    labels = np.array([", ".join(index["features"][i] for i in order[row]) for row in first_row],
+                      dtype=object)
+    return labels[inverse.reshape(-1)]
+
+def find_similar_counties(merged_data, fips_codes=None, k=SIMILARITY_NEIGHBORS,
+                          top_n=SIMILARITY_TOP_FEATURES):
+    """
+    Find the k most similar counties for a batch of counties.
+
+    Args:
+        merged_data: Final merged dataset
+        fips_codes: FIPS codes to query; all counties when None
+        k: Number of neighbors per county
+        top_n: Number of contributing features to report per neighbor
+
+    Returns:
+        pandas.DataFrame: One row per (county, neighbor) with rank, distance and
+        the features contributing most to the distance
+    """
+    index = get_similarity_index(merged_data)
+    query_pos = _query_positions(index, fips_codes)
+    k = min(k, len(index["fips"]) - 1)
+
+    if len(query_pos) == 0 or k < 1:
+        return pd.DataFrame(columns=["FIPS", "Rank", "NeighborFIPS", "Distance", "TopFeatures"])
+
+    # Ask for one extra neighbor so the county itself can be dropped
+    distances, neighbors = index["tree"].query(
+        index["scaled"][query_pos], k=k + 1, workers=-1
+    )
+
+    # Drop the query county from its own neighbor list, keeping k per row
+    not_self = neighbors != query_pos[:, None]
+    keep = not_self & (np.cumsum(not_self, axis=1) <= k)
+    neighbors = neighbors[keep].reshape(len(query_pos), k)
+    distances = distances[keep].reshape(len(query_pos), k)
+
+    query_flat = np.repeat(query_pos, k)
+    neighbor_flat = neighbors.ravel()
+
+    return pd.DataFrame({
+        "FIPS": index["fips"][query_flat],
+        "Rank": np.tile(np.arange(1, k + 1), len(query_pos)),
+        "NeighborFIPS": index["fips"][neighbor_flat],
+        "Distance": distances.ravel(),
+        "TopFeatures": _top_features(index, query_flat, neighbor_flat, top_n),
+    })
+
+def find_counties_within_radius(merged_data, radius, fips_codes=None,
+                                top_n=SIMILARITY_TOP_FEATURES):
+    """
+    Find all counties within a standardized distance of each queried county.
+
+    Args:
+        merged_data: Final merged dataset
+        radius: Maximum distance in standardized feature space
+        fips_codes: FIPS codes to query; all counties when None
+        top_n: Number of contributing features to report per neighbor
+
+    Returns:
+        pandas.DataFrame: One row per (county, neighbor) sorted by distance
+    """
+    index = get_similarity_index(merged_data)
+    query_pos = _query_positions(index, fips_codes)
+
+    # Batch radius query over all requested counties at once
+    matches = index["tree"].query_ball_point(
+        index["scaled"][query_pos], r=radius, workers=-1
+    )
+    counts = np.array([len(m) for m in matches], dtype=np.int64)
+    query_flat = np.repeat(query_pos, counts)
+    neighbor_flat = (np.concatenate([np.asarray(m, dtype=np.int64) for m in matches])
+                     if len(matches) else np.array([], dtype=np.int64))
+
+    # Drop self matches
+    not_self = neighbor_flat != query_flat
+    query_flat = query_flat[not_self]
+    neighbor_flat = neighbor_flat[not_self]
+
+    distances = np.linalg.norm(
+        index["scaled"][query_flat] - index["scaled"][neighbor_flat], axis=1
+    )
+
+    result = pd.DataFrame({
+        "FIPS": index["fips"][query_flat],
+        "NeighborFIPS": index["fips"][neighbor_flat],
+        "Distance": distances,
+        "TopFeatures": _top_features(index, query_flat, neighbor_flat, top_n),
+    })
+    result = result.sort_values(["FIPS", "Distance"], kind="stable").reset_index(drop=True)
+    result.insert(1, "Rank", result.groupby("FIPS").cumcount() + 1)
+    return result
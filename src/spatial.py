@@ -0,0 +1,246 @@
+"""
+Spatial analysis module for the project.
+Loads a county adjacency list into a sparse weights matrix and computes
+spatial lags and Moran's I with sparse matrix-vector products.
+
+The functions work on any GEOID, so tract-level adjacency lists with
+hundreds of thousands of edges load and multiply in linear time.
+
+Usage:
+    python src/spatial.py --input final_merged_data.csv --adjacency county_adjacency.txt
+"""
+import os
+import argparse
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.stats import norm
+
+# Import from local modules
+from config import (
+    ADJACENCY_FILE, SPATIAL_FEATURES, SPATIAL_LAG_SUFFIX, OUTPUT_DIR, OUTPUT_FORMAT,
+    MERGED_DATA_FILE
+)
+from data_loading import load_merged_data
+from analysis import save_table, OUTPUT_FORMATS
+
+def load_adjacency(path=ADJACENCY_FILE):
+    """
+    Load an adjacency list of neighboring areas.
+
+    Three layouts are read: the tab-separated Census county adjacency file,
+    where continuation rows leave the county columns empty; the pipe-separated
+    Census file with a header row; and a CSV whose first two columns hold the
+    FIPS code and the neighbor's FIPS code.
+
+    Args:
+        path: Adjacency file
+
+    Returns:
+        pandas.DataFrame: FIPS and NeighborFIPS pairs without self-neighbors
+    """
+    print(f"Loading adjacency list from '{path}'...")
+
+    with open(path, encoding="latin-1") as f:
+        first_line = f.readline()
+
+    if "|" in first_line:
+        pairs = pd.read_csv(path, sep="|", usecols=["County GEOID", "Neighbor GEOID"],
+                            dtype=str, encoding="latin-1")
+    elif "\t" in first_line:
+        pairs = pd.read_csv(path, sep="\t", header=None, usecols=[1, 3],
+                            dtype=str, encoding="latin-1")
+        # Continuation rows list further neighbors of the county above them
+        pairs[1] = pairs[1].ffill()
+    else:
+        pairs = pd.read_csv(path, usecols=[0, 1], dtype=str)
+
+    pairs.columns = ["FIPS", "NeighborFIPS"]
+    pairs = pairs.dropna()
+    pairs = pairs[pairs["FIPS"] != pairs["NeighborFIPS"]].reset_index(drop=True)
+
+    print(f"Adjacency list loaded: {pairs['FIPS'].nunique()} areas, {len(pairs)} neighbor pairs")
+    return pairs
+
+def build_weights(pairs, fips):
+    """
+    Build a row-standardized sparse spatial weights matrix.
+
+    Pairs are made symmetric, so lists giving each border once or twice give
+    the same matrix. Pairs involving codes outside fips are ignored, and areas
+    without neighbors keep an empty row.
+
+    Args:
+        pairs: FIPS and NeighborFIPS pairs from load_adjacency
+        fips: Area codes in the row order of the matrix, e.g. merged_data['FIPS']
+
+    Returns:
+        scipy.sparse.csr_matrix: Weights matrix whose non-empty rows sum to one
+    """
+    index = pd.Index(fips)
+    if not index.is_unique:
+        raise ValueError("FIPS codes must be unique to build spatial weights")
+
+    rows = index.get_indexer(pairs["FIPS"])
+    cols = index.get_indexer(pairs["NeighborFIPS"])
+    keep = (rows >= 0) & (cols >= 0)
+    rows, cols = rows[keep], cols[keep]
+
+    # Converting to CSR sums duplicate pairs, which are then reset to one
+    weights = sparse.csr_matrix(
+        (np.ones(2 * len(rows)), (np.concatenate([rows, cols]), np.concatenate([cols, rows]))),
+        shape=(len(index), len(index))
+    )
+    weights.data[:] = 1.0
+
+    neighbors = np.diff(weights.indptr)
+    weights.data /= np.repeat(neighbors, neighbors)
+    return weights
+
+def spatial_lag(weights, values):
+    """
+    Average each area's neighbors with one sparse matrix product.
+
+    Missing neighbor values are left out and the remaining weights rescaled;
+    areas without observed neighbors get NaN.
+
+    Args:
+        weights: Row-standardized weights from build_weights
+        values: Array of one value per area, or a 2-D array of one column per variable
+
+    Returns:
+        numpy.ndarray: Spatial lag with the shape of values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    observed = ~np.isnan(values)
+
+    weighted_sum = weights @ np.where(observed, values, 0.0)
+    weight_total = weights @ observed.astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(weight_total > 0, weighted_sum / weight_total, np.nan)
+
+def morans_i(weights, values):
+    """
+    Compute Moran's I with its z-score under the normality assumption.
+
+    Areas with a missing value are dropped from the matrix first.
+
+    Args:
+        weights: Spatial weights from build_weights
+        values: One value per area
+
+    Returns:
+        dict: MoransI, Expected, ZScore, PValue (two-sided) and N
+    """
+    values = np.asarray(values, dtype=np.float64)
+    observed = ~np.isnan(values)
+    if not observed.all():
+        weights = weights[observed][:, observed]
+        values = values[observed]
+
+    n = len(values)
+    deviations = values - values.mean()
+    s0 = weights.sum()
+    statistic = n / s0 * (deviations @ (weights @ deviations)) / (deviations @ deviations)
+    expected = -1.0 / (n - 1)
+
+    # Variance terms computed on the sparse structure only
+    symmetric = weights + weights.T
+    s1 = 0.5 * symmetric.multiply(symmetric).sum()
+    margins = np.asarray(weights.sum(axis=1)).ravel() + np.asarray(weights.sum(axis=0)).ravel()
+    s2 = np.sum(margins ** 2)
+    variance = (n * n * s1 - n * s2 + 3 * s0 * s0) / ((n * n - 1) * s0 * s0) - expected ** 2
+
+    z_score = (statistic - expected) / np.sqrt(variance)
+    return {
+        "MoransI": statistic,
+        "Expected": expected,
+        "ZScore": z_score,
+        "PValue": 2 * norm.sf(abs(z_score)),
+        "N": n,
+    }
+
+def add_spatial_lags(merged_data, weights, columns=SPATIAL_FEATURES):
+    """
+    Add spatial-lag columns to a dataset.
+
+    Args:
+        merged_data: Dataset in the row order of the weights matrix
+        weights: Row-standardized weights from build_weights
+        columns: Columns to lag; each gets a SPATIAL_LAG_SUFFIX column
+
+    Returns:
+        pandas.DataFrame: Copy of the dataset with the lag columns
+    """
+    columns = [col for col in columns if col in merged_data.columns]
+    values = merged_data[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    # One sparse product lags every column at once
+    lags = spatial_lag(weights, values).astype(np.float32)
+
+    lagged = merged_data.copy()
+    for i, column in enumerate(columns):
+        lagged[column + SPATIAL_LAG_SUFFIX] = lags[:, i]
+    return lagged
+
+def spatial_autocorrelation(merged_data, weights, columns=SPATIAL_FEATURES):
+    """
+    Compute Moran's I for several columns.
+
+    Args:
+        merged_data: Dataset in the row order of the weights matrix
+        weights: Spatial weights from build_weights
+        columns: Columns to test
+
+    Returns:
+        pandas.DataFrame: One row of Moran's I results per column
+    """
+    results = {
+        column: morans_i(weights, merged_data[column].to_numpy(dtype=np.float64, na_value=np.nan))
+        for column in columns if column in merged_data.columns
+    }
+    return pd.DataFrame.from_dict(results, orient="index")
+
+def run_spatial_analysis(merged_data, adjacency_path=ADJACENCY_FILE, output_dir=OUTPUT_DIR,
+                         file_format=OUTPUT_FORMAT):
+    """
+    Add spatial lags to the merged dataset and test for spatial autocorrelation.
+
+    Args:
+        merged_data: Final merged dataset
+        adjacency_path: Adjacency file read by load_adjacency
+        output_dir: Directory to save the results in
+        file_format: File format of the saved tables
+
+    Returns:
+        dict: Dataset with spatial-lag columns and the Moran's I table
+    """
+    print("SPATIAL ANALYSIS")
+
+    weights = build_weights(load_adjacency(adjacency_path), merged_data["FIPS"])
+    islands = int(np.count_nonzero(np.diff(weights.indptr) == 0))
+    print(f"Spatial weights: {weights.nnz} links, {islands} counties without neighbors in the data")
+
+    lagged = add_spatial_lags(merged_data, weights)
+    moran = spatial_autocorrelation(merged_data, weights)
+    print("Moran's I:")
+    print(moran)
+
+    os.makedirs(output_dir, exist_ok=True)
+    file_name = save_table(lagged, output_dir, "spatial_lag_data", file_format, index=False)
+    print(f"Spatial-lag dataset saved to '{file_name}'")
+    file_name = save_table(moran, output_dir, "morans_i", file_format)
+    print(f"Moran's I results saved to '{file_name}'")
+
+    return {"data": lagged, "morans_i": moran}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute spatial lags and Moran's I")
+    parser.add_argument("--input", default=MERGED_DATA_FILE, help="Saved merged dataset")
+    parser.add_argument("--adjacency", default=ADJACENCY_FILE, help="Adjacency list file")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default=OUTPUT_FORMAT)
+    args = parser.parse_args()
+
+    run_spatial_analysis(load_merged_data(args.input), args.adjacency, args.output_dir, args.format)
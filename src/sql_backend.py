@@ -0,0 +1,165 @@
+"""
+SQL backend module for the project.
+DuckDB implementations of the descriptive statistics, correlation and
+state-level aggregations in analysis.py.
+
+Each function accepts either a DataFrame or the path of a persisted CSV or
+Parquet file, so large merged or panel datasets can be queried in place
+without loading them into pandas first.
+"""
+import numpy as np
+import pandas as pd
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# Import from config
+from config import DUCKDB_THREADS, DUCKDB_MEMORY_LIMIT, DUCKDB_TEMP_DIRECTORY
+
+# DuckDB column types treated as numeric, matching pandas select_dtypes(np.number)
+NUMERIC_TYPES = (
+    "TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT", "UTINYINT", "USMALLINT",
+    "UINTEGER", "UBIGINT", "FLOAT", "DOUBLE", "REAL",
+)
+
+# Row labels of pandas DataFrame.describe()
+DESCRIBE_ROWS = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+
+def connect():
+    """
+    Open an in-memory DuckDB connection configured from config.py.
+
+    Returns:
+        duckdb.DuckDBPyConnection: Configured connection
+    """
+    if duckdb is None:
+        raise ImportError("The duckdb backend requires the duckdb package: pip install duckdb")
+
+    con = duckdb.connect()
+    if DUCKDB_THREADS:
+        con.execute(f"SET threads = {int(DUCKDB_THREADS)}")
+    if DUCKDB_MEMORY_LIMIT:
+        con.execute(f"SET memory_limit = '{DUCKDB_MEMORY_LIMIT}'")
+    if DUCKDB_TEMP_DIRECTORY:
+        con.execute(f"SET temp_directory = '{DUCKDB_TEMP_DIRECTORY}'")
+    return con
+
+def _quote(name):
+    """Quote a column name as a SQL identifier."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+def _source(con, data):
+    """Return a SQL table expression for a DataFrame or a persisted file."""
+    if isinstance(data, pd.DataFrame):
+        con.register("merged_data", data)
+        return "merged_data"
+
+    path = str(data).replace("'", "''")
+    if path.endswith(".parquet"):
+        return f"read_parquet('{path}')"
+    return f"read_csv_auto('{path}', types={{'FIPS': 'VARCHAR'}})"
+
+def _numeric_columns(con, source):
+    """List the numeric columns of a table expression."""
+    columns = con.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()
+    return [name for name, column_type, *_ in columns if column_type.upper() in NUMERIC_TYPES]
+
+def sql_descriptive_statistics(data, columns=None):
+    """
+    Compute DataFrame.describe() statistics in DuckDB.
+
+    Args:
+        data: Merged dataset as a DataFrame or a CSV/Parquet path
+        columns: Columns to describe; all numeric columns when None
+
+    Returns:
+        pandas.DataFrame: Descriptive statistics table laid out like describe()
+    """
+    con = connect()
+    source = _source(con, data)
+    columns = columns or _numeric_columns(con, source)
+
+    selects = []
+    for column in columns:
+        value = f"CAST({_quote(column)} AS DOUBLE)"
+        selects += [
+            f"CAST(COUNT({value}) AS DOUBLE)",
+            f"AVG({value})",
+            f"STDDEV_SAMP({value})",
+            f"MIN({value})",
+            f"QUANTILE_CONT({value}, 0.25)",
+            f"QUANTILE_CONT({value}, 0.5)",
+            f"QUANTILE_CONT({value}, 0.75)",
+            f"MAX({value})",
+        ]
+
+    row = con.execute(f"SELECT {', '.join(selects)} FROM {source}").fetchone()
+    con.close()
+
+    values = np.array(row, dtype=np.float64).reshape(len(columns), len(DESCRIBE_ROWS)).T
+    return pd.DataFrame(values, index=DESCRIBE_ROWS, columns=columns)
+
+def sql_correlation_matrix(data, columns):
+    """
+    Compute a pairwise Pearson correlation matrix in DuckDB.
+
+    Rows with a missing value in either column of a pair are skipped for that
+    pair, as in DataFrame.corr().
+
+    Args:
+        data: Merged dataset as a DataFrame or a CSV/Parquet path
+        columns: Columns to correlate
+
+    Returns:
+        pandas.DataFrame: Correlation matrix
+    """
+    con = connect()
+    source = _source(con, data)
+
+    pairs = [(i, j) for i in range(len(columns)) for j in range(i + 1, len(columns))]
+    matrix = np.eye(len(columns))
+    if pairs:
+        selects = [
+            f"CORR(CAST({_quote(columns[i])} AS DOUBLE), CAST({_quote(columns[j])} AS DOUBLE))"
+            for i, j in pairs
+        ]
+        row = con.execute(f"SELECT {', '.join(selects)} FROM {source}").fetchone()
+        for (i, j), value in zip(pairs, row):
+            matrix[i, j] = matrix[j, i] = np.nan if value is None else value
+    con.close()
+
+    return pd.DataFrame(matrix, index=columns, columns=columns)
+
+def sql_group_statistics(data, columns, group_by=("State",), count_column="FIPS",
+                         sort_column="MedianHomeValue"):
+    """
+    Compute group averages and counts in DuckDB.
+
+    Args:
+        data: Merged or panel dataset as a DataFrame or a CSV/Parquet path
+        columns: Columns to average
+        group_by: Grouping columns, e.g. ('State',) or ('Year', 'State')
+        count_column: Column whose non-null values are counted as CountyCount
+        sort_column: Column to sort the groups by, descending
+
+    Returns:
+        pandas.DataFrame: Group statistics indexed by the grouping columns
+    """
+    con = connect()
+    source = _source(con, data)
+
+    keys = ", ".join(_quote(col) for col in group_by)
+    averages = ", ".join(
+        f"AVG(CAST({_quote(col)} AS DOUBLE)) AS {_quote(col)}" for col in columns
+    )
+    query = (
+        f"SELECT {keys}, {averages}, COUNT({_quote(count_column)}) AS CountyCount "
+        f"FROM {source} WHERE {' AND '.join(f'{_quote(c)} IS NOT NULL' for c in group_by)} "
+        f"GROUP BY {keys} ORDER BY {_quote(sort_column)} DESC"
+    )
+    group_stats = con.execute(query).df()
+    con.close()
+
+    return group_stats.set_index(list(group_by))
@@ -0,0 +1,305 @@
+"""
+Synthetic data module for the project.
+Deterministic generators for Zillow, Census and BLS shaped source data.
+"""
+import os
+import json
+import numpy as np
+import pandas as pd
+
+# Import from config
+from config import (
+    CENSUS_YEAR, LATEST_DATE, BENCHMARK_SEED, ZILLOW_URL,
+    CENSUS_ECONOMIC_FIELDS, CENSUS_EDUCATION_FIELDS
+)
+from data_loading import bls_data_url
+from fixtures import url_fixture_name, census_fixture_name, write_fixture, write_json_fixture
+
+# State FIPS codes and abbreviations used to spread synthetic counties
+STATES = [
+    ("01", "AL"), ("02", "AK"), ("04", "AZ"), ("05", "AR"), ("06", "CA"),
+    ("08", "CO"), ("09", "CT"), ("10", "DE"), ("12", "FL"), ("13", "GA"),
+    ("15", "HI"), ("16", "ID"), ("17", "IL"), ("18", "IN"), ("19", "IA"),
+    ("20", "KS"), ("21", "KY"), ("22", "LA"), ("23", "ME"), ("24", "MD"),
+    ("25", "MA"), ("26", "MI"), ("27", "MN"), ("28", "MS"), ("29", "MO"),
+    ("30", "MT"), ("31", "NE"), ("32", "NV"), ("33", "NH"), ("34", "NJ"),
+    ("35", "NM"), ("36", "NY"), ("37", "NC"), ("38", "ND"), ("39", "OH"),
+    ("40", "OK"), ("41", "OR"), ("42", "PA"), ("44", "RI"), ("45", "SC"),
+    ("46", "SD"), ("47", "TN"), ("48", "TX"), ("49", "UT"), ("50", "VT"),
+    ("51", "VA"), ("53", "WA"), ("54", "WV"), ("55", "WI"), ("56", "WY"),
+]
+
+# Share of counties dropped from each source so merges exercise the inner joins
+MISSING_SHARE = 0.02
+
+# Distinct county names per county; names like "Washington County" repeat across states
+NAME_SHARE = 0.6
+
+def generate_counties(n_counties, seed=BENCHMARK_SEED):
+    """
+    Generate the synthetic county universe shared by all sources.
+
+    Counties are spread evenly over the states with odd county codes, as in
+    real FIPS numbering. Beyond 500 counties per state the county codes grow
+    past three digits, which keeps FIPS codes unique at any size.
+
+    Args:
+        n_counties: Number of counties to generate
+        seed: Random seed
+
+    Returns:
+        pandas.DataFrame: County keys and latent socio-economic values
+    """
+    rng = np.random.default_rng(seed)
+    positions = np.arange(n_counties)
+    state_idx = positions % len(STATES)
+    county_codes = (positions // len(STATES)) * 2 + 1
+
+    n_names = max(1, int(n_counties * NAME_SHARE))
+    state_fips = np.array([fips for fips, _ in STATES])[state_idx]
+    state_abbr = np.array([abbr for _, abbr in STATES])[state_idx]
+
+    # Latent drivers so the socio-economic variables correlate like real data
+    prosperity = rng.normal(0, 1, n_counties)
+    income = np.clip(60000 + 15000 * prosperity + rng.normal(0, 5000, n_counties), 20000, None)
+    population = np.round(rng.lognormal(10.3, 1.4, n_counties)).astype(np.int64) + 100
+    poverty_rate = np.clip(14 - 4 * prosperity + rng.normal(0, 2, n_counties), 1, 60)
+    college_pct = np.clip(22 + 8 * prosperity + rng.normal(0, 3, n_counties), 2, 80)
+    unemployment = np.clip(4 - 0.8 * prosperity + rng.normal(0, 0.7, n_counties), 0.5, 25)
+    home_value = np.clip(
+        4.2 * income + 2500 * college_pct + rng.normal(0, 30000, n_counties), 30000, None
+    )
+
+    return pd.DataFrame({
+        "StateFIPS": state_fips,
+        "CountyCode": county_codes,
+        "State": state_abbr,
+        "CountyName": [f"Synthetic County {i}" for i in rng.integers(0, n_names, n_counties)],
+        "MedianIncome": income,
+        "Population": population,
+        "PovertyRate": poverty_rate,
+        "CollegePct": college_pct,
+        "UnemploymentRate": unemployment,
+        "HomeValue": home_value,
+    })
+
+def _subsample(counties, rng):
+    """Drop a random share of counties from one source."""
+    keep = rng.random(len(counties)) >= MISSING_SHARE
+    return counties[keep]
+
+def generate_zillow_data(counties, n_months, end_date=LATEST_DATE, seed=BENCHMARK_SEED):
+    """
+    Generate a Zillow-shaped wide home value table.
+
+    Args:
+        counties: Synthetic counties from generate_counties
+        n_months: Number of monthly value columns ending at end_date
+        end_date: Last month-end column
+        seed: Random seed
+
+    Returns:
+        pandas.DataFrame: One row per county with one column per month
+    """
+    rng = np.random.default_rng(seed + 1)
+    counties = _subsample(counties, rng)
+    n = len(counties)
+
+    zillow_df = pd.DataFrame({
+        "RegionID": np.arange(n) + 1000,
+        "SizeRank": np.arange(n),
+        "RegionName": counties["CountyName"].to_numpy(),
+        "RegionType": "county",
+        "StateName": counties["State"].to_numpy(),
+        "State": counties["State"].to_numpy(),
+        "Metro": "Synthetic Metro",
+        "StateCodeFIPS": counties["StateFIPS"].astype(int).to_numpy(),
+        "MunicipalCodeFIPS": counties["CountyCode"].to_numpy(),
+    })
+
+    # Walk home values backwards from the end date with small monthly growth
+    months = pd.period_range(end=end_date, periods=n_months, freq="M")
+    months = months.to_timestamp(how="end").strftime("%Y-%m-%d")
+    growth = rng.normal(0.004, 0.01, (n, n_months))
+    growth[:, -1] = 0
+    discount = np.exp(-np.cumsum(growth[:, ::-1], axis=1)[:, ::-1])
+    values = np.round(counties["HomeValue"].to_numpy()[:, None] * discount)
+
+    # Older months have gaps, as counties enter the index over time
+    values[rng.random((n, n_months)) < 0.01] = np.nan
+    values[:, -1] = np.round(counties["HomeValue"].to_numpy())
+
+    return pd.concat([zillow_df, pd.DataFrame(values, columns=months)], axis=1)
+
+def generate_census_economic_rows(counties, seed=BENCHMARK_SEED):
+    """
+    Generate Census-shaped economic rows as returned by the Census API.
+
+    Args:
+        counties: Synthetic counties from generate_counties
+        seed: Random seed
+
+    Returns:
+        list: One dict per county with NAME, ACS fields, state and county
+    """
+    rng = np.random.default_rng(seed + 2)
+    counties = _subsample(counties, rng)
+    poverty_count = np.round(counties["Population"] * counties["PovertyRate"] / 100)
+
+    return pd.DataFrame({
+        "NAME": counties["CountyName"] + ", " + counties["State"],
+        "B19013_001E": np.round(counties["MedianIncome"]),
+        "B01003_001E": counties["Population"].astype(float),
+        "B17001_002E": poverty_count,
+        "state": counties["StateFIPS"],
+        "county": counties["CountyCode"].astype(str).str.zfill(3),
+    }).to_dict(orient="records")
+
+def generate_census_education_rows(counties, seed=BENCHMARK_SEED):
+    """
+    Generate Census-shaped education rows as returned by the Census API.
+
+    Args:
+        counties: Synthetic counties from generate_counties
+        seed: Random seed
+
+    Returns:
+        list: One dict per county with NAME, ACS fields, state and county
+    """
+    rng = np.random.default_rng(seed + 3)
+    counties = _subsample(counties, rng)
+    total = np.round(counties["Population"].to_numpy() * 0.68)
+    college = total * counties["CollegePct"].to_numpy() / 100
+
+    # Split college graduates across degree levels
+    shares = rng.dirichlet([6, 2.5, 0.8, 0.7], len(counties))
+    degrees = np.round(college[:, None] * shares)
+
+    return pd.DataFrame({
+        "NAME": counties["CountyName"] + ", " + counties["State"],
+        "B15003_022E": degrees[:, 0],
+        "B15003_023E": degrees[:, 1],
+        "B15003_024E": degrees[:, 2],
+        "B15003_025E": degrees[:, 3],
+        "B15003_001E": total,
+        "state": counties["StateFIPS"],
+        "county": counties["CountyCode"].astype(str).str.zfill(3),
+    }).to_dict(orient="records")
+
+def generate_bls_sheet(counties, year=CENSUS_YEAR, seed=BENCHMARK_SEED):
+    """
+    Generate a BLS-shaped county unemployment sheet.
+
+    Args:
+        counties: Synthetic counties from generate_counties
+        year: Year written in the Year column
+        seed: Random seed
+
+    Returns:
+        pandas.DataFrame: Sheet rows in the column order of the BLS export
+    """
+    rng = np.random.default_rng(seed + 4)
+    counties = _subsample(counties, rng)
+    labor_force = np.round(counties["Population"].to_numpy() * 0.48)
+    unemployed = np.round(labor_force * counties["UnemploymentRate"].to_numpy() / 100)
+
+    return pd.DataFrame({
+        "LAUS Code": "CN" + counties["StateFIPS"] + counties["CountyCode"].astype(str).str.zfill(3),
+        "State FIPS Code": counties["StateFIPS"],
+        "County FIPS Code": counties["CountyCode"].astype(str).str.zfill(3),
+        "County Name/State Abbreviation": counties["CountyName"] + ", " + counties["State"],
+        "Year": year,
+        "Labor Force": labor_force,
+        "Employed": labor_force - unemployed,
+        "Unemployed": unemployed,
+        "Unemployment Rate (%)": np.round(counties["UnemploymentRate"].to_numpy(), 1),
+    })
+
+def write_synthetic_sources(output_dir, n_counties, n_months, seed=BENCHMARK_SEED):
+    """
+    Write a full set of synthetic source files.
+
+    The Zillow and BLS files are CSVs laid out like the downloaded files, with
+    the BLS title row that load_bls_data skips. The Census files hold the JSON
+    rows returned by the Census API.
+
+    Args:
+        output_dir: Directory to write the files into
+        n_counties: Number of counties to generate
+        n_months: Number of monthly Zillow columns
+        seed: Random seed
+
+    Returns:
+        dict: Paths of the written files keyed by source name
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    counties = generate_counties(n_counties, seed)
+    paths = {
+        "zillow": os.path.join(output_dir, "zillow.csv"),
+        "bls": os.path.join(output_dir, "bls.csv"),
+        "census_economic": os.path.join(output_dir, "census_economic.json"),
+        "census_education": os.path.join(output_dir, "census_education.json"),
+    }
+
+    generate_zillow_data(counties, n_months, seed=seed).to_csv(paths["zillow"], index=False)
+
+    with open(paths["bls"], "w") as f:
+        f.write("Labor force data by county, annual averages\n")
+        generate_bls_sheet(counties, seed=seed).to_csv(f, index=False)
+
+    with open(paths["census_economic"], "w") as f:
+        json.dump(generate_census_economic_rows(counties, seed), f)
+    with open(paths["census_education"], "w") as f:
+        json.dump(generate_census_education_rows(counties, seed), f)
+
+    return paths
+
+def write_synthetic_fixtures(fixture_dir, n_counties, n_months, seed=BENCHMARK_SEED,
+                             year=CENSUS_YEAR):
+    """
+    Write synthetic sources as replay fixtures.
+
+    The fixtures are named like recorded responses of the live sources, so
+    the full pipeline runs on synthetic data in replay mode. Census rows are
+    written for the national request and for each state, as requested by the
+    sharded pipeline.
+
+    Args:
+        fixture_dir: Directory to write the fixtures into
+        n_counties: Number of counties to generate
+        n_months: Number of monthly Zillow columns, ending at LATEST_DATE
+        seed: Random seed
+        year: Data year of the BLS and Census fixtures
+
+    Returns:
+        list: Paths of the written fixtures
+    """
+    counties = generate_counties(n_counties, seed)
+    paths = []
+
+    def write(name, data):
+        path = os.path.join(fixture_dir, name)
+        if isinstance(data, bytes):
+            write_fixture(path, data)
+        else:
+            write_json_fixture(path, data)
+        paths.append(path)
+
+    write(url_fixture_name("zillow", ZILLOW_URL),
+          generate_zillow_data(counties, n_months, seed=seed).to_csv(index=False).encode())
+
+    bls_sheet = generate_bls_sheet(counties, year, seed).to_csv(index=False)
+    write(url_fixture_name("bls", bls_data_url(year)),
+          ("Labor force data by county, annual averages\n" + bls_sheet).encode())
+
+    requests = [
+        (CENSUS_ECONOMIC_FIELDS, generate_census_economic_rows(counties, seed)),
+        (CENSUS_EDUCATION_FIELDS, generate_census_education_rows(counties, seed)),
+    ]
+    for fields, rows in requests:
+        write(census_fixture_name(fields, year), rows)
+        for state_fips, _ in STATES:
+            state_rows = [row for row in rows if row["state"] == state_fips]
+            write(census_fixture_name(fields, year, state_fips), state_rows)
+
+    return paths
@@ -6,12 +6,53 @@ import pandas as pd
 import numpy as np
 import sys
 import os
+import json
+import tempfile
+import unittest
+import contextlib
+from unittest import mock
+import matplotlib
+
+# Analysis functions save figures; render them off-screen
+matplotlib.use("Agg")
 
 # Add src directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.data_cleaning import clean_zillow_data
-from src.data_merging import merge_all_data
+from src.data_merging import merge_census_data, merge_all_data
+from src.similarity import find_similar_counties, find_counties_within_radius
+from src.query_service import CountyQueryService
+from src.synthetic_data import (
+    generate_counties, generate_zillow_data, generate_census_economic_rows,
+    generate_census_education_rows, generate_bls_sheet, write_synthetic_fixtures
+)
+from src.schema import apply_schema, validate_frame
+from src.analysis import basic_descriptive_statistics, correlation_analysis, state_level_analysis, save_table
+from src.sql_backend import duckdb
+from src.sharded import share_frame, attach_frame, release_frame, run_sharded_pipeline
+from src.data_loading import (
+    prepare_bls_data, prepare_census_economic_data, prepare_census_education_data,
+    load_bls_data, load_census_economic_data, bls_data_url
+)
+from src.fixtures import open_csv_source, census_rows
+from src.main import main as pipeline_main, run_pipeline
+from src.multi_year import (
+    configured_years, panel_state_statistics, run_multi_year_pipeline, BLS_FILE_IDS
+)
+from src.report import build_report
+from src.spatial import load_adjacency, build_weights, add_spatial_lags, morans_i
+
+def _synthetic_merged(n_counties, seed, n_months=12):
+    """Run synthetic sources through preparation, cleaning and merging."""
+    counties = generate_counties(n_counties, seed=seed)
+    census = merge_census_data(
+        prepare_census_economic_data(generate_census_economic_rows(counties, seed=seed)),
+        prepare_census_education_data(generate_census_education_rows(counties, seed=seed))
+    )
+    zillow = clean_zillow_data(generate_zillow_data(counties, n_months=n_months, seed=seed))
+    bls = prepare_bls_data(generate_bls_sheet(counties, seed=seed))
+    return merge_all_data(zillow, census, bls)
 
 def test_fips_code_creation():
     """Test that FIPS codes are created correctly from State and County codes."""
@@ -168,6 +209,437 @@ def test_column_validation():
     print("Column validation test passed")
     return True
 
+def test_similar_counties():
+    """Test batch nearest-neighbor and radius queries on the similarity index."""
+    print("Testing similar counties...")
+
+    # Two tight groups of counties in feature space
+    test_data = pd.DataFrame({
+        'FIPS': ['06001', '06003', '36001', '36003'],
+        'Median_Income': [80000.0, 81000.0, 40000.0, 41000.0],
+        'Population': [100000, 101000, 20000, 21000],
+        'Poverty_Rate': [10.0, 10.5, 20.0, 20.5],
+        'College_Educated_Pct': [40.0, 41.0, 15.0, 16.0],
+        'UnemploymentRate': [4.0, 4.1, 7.0, 7.1]
+    })
+
+    neighbors = find_similar_counties(test_data, k=1)
+    assert len(neighbors) == 4, "Should return one neighbor per county"
+    pairs = dict(zip(neighbors['FIPS'], neighbors['NeighborFIPS']))
+    assert pairs['06001'] == '06003', "06001 should match 06003"
+    assert pairs['36003'] == '36001', "36003 should match 36001"
+    assert (neighbors['Distance'] > 0).all(), "A county should not match itself"
+    assert neighbors['TopFeatures'].str.len().gt(0).all(), "Should name contributing features"
+
+    within = find_counties_within_radius(test_data, radius=0.5, fips_codes=['06001'])
+    assert within['NeighborFIPS'].tolist() == ['06003'], "Only 06003 should be within radius"
+
+    print("Similar counties test passed")
+    return True
+
+def test_query_service():
+    """Test lookups, filters, rollups and response caching in the query service."""
+    print("Testing query service...")
+
+    # Persist a small merged dataset like save_analysis_results does
+    output_dir = tempfile.mkdtemp()
+    data_path = os.path.join(output_dir, 'final_merged_data.csv')
+    test_data = pd.DataFrame({
+        'FIPS': ['06001', '06003', '36001'],
+        'County': ['County A', 'County B', 'County C'],
+        'State': ['CA', 'CA', 'NY'],
+        'MedianHomeValue': [500000.0, 400000.0, 300000.0],
+        'UnemploymentRate': [4.4, 5.0, 8.0]
+    })
+    test_data.to_csv(data_path, index=False)
+
+    service = CountyQueryService(data_path)
+
+    status, body = service.handle('/county/06001')
+    assert status == 200, "Known county should be found"
+    assert json.loads(body)['County'] == 'County A', "Should return the matching county"
+    assert json.loads(body)['UnemploymentRate'] == 4.4, "Float32 values should be written without rounding noise"
+    assert service.handle('/county/99999')[0] == 404, "Unknown county should return 404"
+
+    status, body = service.handle('/counties', [('state', 'CA'), ('min_MedianHomeValue', '450000')])
+    assert json.loads(body)['count'] == 1, "Only one CA county is above 450000"
+
+    status, body = service.handle('/states')
+    assert [row['State'] for row in json.loads(body)] == ['CA', 'NY'], "States should be ranked by home value"
+
+    service.handle('/states')
+    metrics = service.metrics()
+    assert metrics['cache']['hits'] == 1, "Repeated request should be served from the cache"
+    assert metrics['endpoints']['/states']['requests'] == 2, "Should count requests per endpoint"
+
+    json_file = save_table(service.data, output_dir, 'final_merged_data', 'json', index=False)
+    with open(os.path.join(output_dir, json_file)) as f:
+        assert '"UnemploymentRate":4.4}' in f.read(), "Saved JSON should not carry float32 noise"
+    status, body = CountyQueryService(os.path.join(output_dir, json_file)).handle('/county/06001')
+    assert json.loads(body)['County'] == 'County A', "Should serve a dataset saved as JSON"
+
+    print("Query service test passed")
+    return True
+
+def test_synthetic_pipeline():
+    """Test that synthetic source data runs through cleaning and merging deterministically."""
+    print("Testing synthetic pipeline...")
+
+    counties = generate_counties(500, seed=7)
+    zillow = generate_zillow_data(counties, n_months=24, seed=7)
+    assert zillow.shape[1] == 9 + 24, "Should have 9 key columns and one column per month"
+    assert zillow.columns[-1] == '2022-12-31', "Last month should be the latest date"
+
+    merged = _synthetic_merged(500, seed=7, n_months=24)
+
+    assert 400 < len(merged) < 500, "Inner joins should drop the counties missing from a source"
+    assert merged['FIPS'].is_unique, "FIPS codes should be unique"
+    assert merged['FIPS'].str.len().eq(5).all(), "FIPS codes should be 5 characters"
+
+    again = generate_zillow_data(generate_counties(500, seed=7), n_months=24, seed=7)
+    assert again.equals(zillow), "Generator should be deterministic for a seed"
+
+    print("Synthetic pipeline test passed")
+    return True
+
+def test_year_alignment():
+    """Test that cleaning and BLS preparation select the requested year."""
+    print("Testing year alignment...")
+
+    counties = generate_counties(100, seed=3)
+    zillow = generate_zillow_data(counties, n_months=36, seed=3)
+
+    cleaned_2021 = clean_zillow_data(zillow, '2021-12-31')
+    cleaned_2022 = clean_zillow_data(zillow)
+    assert not cleaned_2021['MedianHomeValue'].equals(cleaned_2022['MedianHomeValue']), \
+        "Different years should use different Zillow months"
+
+    sheet = pd.concat([
+        generate_bls_sheet(counties, year=2021, seed=3),
+        generate_bls_sheet(counties, year=2022, seed=3)
+    ])
+    bls_2021 = prepare_bls_data(sheet, 2021)
+    assert len(bls_2021) == len(generate_bls_sheet(counties, year=2021, seed=3)), \
+        "Should keep only the requested year"
+
+    # Years without a configured BLS sheet are skipped, not read from another year's sheet
+    assert configured_years([2015, 2022]) == [2022], "Unconfigured years should be skipped"
+    try:
+        bls_data_url(2015)
+        assert False, "A year without a BLS sheet should be rejected"
+    except ValueError:
+        pass
+
+    print("Year alignment test passed")
+    return True
+
+def test_schema_enforcement():
+    """Test that the schema compacts dtypes and flags invalid values."""
+    print("Testing schema enforcement...")
+
+    raw = pd.DataFrame({
+        'FIPS': ['06001', '36002', '48003'],
+        'County': ['Washington County', 'Washington County', 'Travis County'],
+        'State': ['CA', 'NY', 'TX'],
+        'MedianHomeValue': [500000.0, 300000.0, 250000.0],
+        'Population': [100000.0, np.nan, 50000.0],
+        'UnemploymentRate': [4.5, 5.0, 140.0],
+        'Extra': [1, 2, 3]
+    })
+
+    typed = apply_schema(raw, "Test")
+    assert typed['County'].dtype == 'category', "County should be categorical"
+    assert typed['State'].dtype == 'category', "State should be categorical"
+    assert typed['MedianHomeValue'].dtype == np.float32, "Values should be float32"
+    assert str(typed['Population'].dtype) == 'Int32', "Population should be a nullable integer"
+    assert typed['Population'].isna().sum() == 1, "Missing population should stay missing"
+    assert typed['Extra'].dtype == raw['Extra'].dtype, "Columns outside the schema are unchanged"
+
+    issues = validate_frame(typed, "Test")
+    assert list(issues.index) == ['UnemploymentRate'], "Only the 140% unemployment rate is invalid"
+    assert issues.loc['UnemploymentRate', 'above_max'] == 1, "Should count one value above range"
+
+    missing_fips = apply_schema(pd.DataFrame({'FIPS': ['06001', None, np.nan]}), "Test")
+    assert missing_fips['FIPS'].isna().sum() == 2, "Missing FIPS codes should not become strings"
+    issues = validate_frame(missing_fips, "Test")
+    assert issues.loc['FIPS', 'nulls'] == 2, "Missing FIPS codes should be reported"
+
+    print("Schema enforcement test passed")
+    return True
+
+def test_duckdb_backend_matches_pandas():
+    """Test that the DuckDB backend reproduces the pandas statistics."""
+    print("Testing DuckDB backend...")
+
+    if duckdb is None:
+        raise unittest.SkipTest("duckdb not installed")
+
+    merged = _synthetic_merged(2000, seed=11)
+    output_dir = tempfile.mkdtemp()
+    data_path = os.path.join(output_dir, 'final_merged_data.csv')
+    merged.to_csv(data_path, index=False)
+
+    # Float32 columns are averaged in float32 by pandas, so compare to that precision
+    pandas_stats = basic_descriptive_statistics(merged, backend="pandas")
+    for source in [merged, data_path]:
+        duckdb_stats = basic_descriptive_statistics(source, backend="duckdb")
+        assert list(duckdb_stats.columns) == list(pandas_stats.columns), "Same numeric columns"
+        assert np.allclose(duckdb_stats, pandas_stats.astype(float), rtol=1e-6), "Descriptive statistics should match"
+
+    pandas_corr = correlation_analysis(merged, backend="pandas")
+    duckdb_corr = correlation_analysis(data_path, backend="duckdb")
+    assert np.allclose(duckdb_corr, pandas_corr, atol=1e-9), "Correlations should match"
+
+    pandas_states = state_level_analysis(merged, output_dir, backend="pandas")
+    duckdb_states = state_level_analysis(merged, output_dir, backend="duckdb")
+    assert list(duckdb_states.index) == list(pandas_states.index), "States should be in the same order"
+    assert np.allclose(duckdb_states, pandas_states, rtol=1e-6), "State averages should match"
+
+    # --input with only SQL outputs is analyzed in place rather than loaded
+    result = run_pipeline(outputs=["stats", "states"], output_dir=output_dir,
+                          backend="duckdb", input_path=data_path)
+    assert result == data_path, "DuckDB should query the saved file without loading it"
+    saved_states = pd.read_csv(os.path.join(output_dir, 'state_level_statistics.csv'), index_col=0)
+    assert np.allclose(saved_states, pandas_states, rtol=1e-6), "Saved state rollup should match"
+
+    panel_path = os.path.join(output_dir, 'panel_data.csv')
+    pd.concat([merged.assign(Year=2021), merged.assign(Year=2022)]).to_csv(panel_path, index=False)
+    pandas_panel = panel_state_statistics(panel_path, backend="pandas")
+    duckdb_panel = panel_state_statistics(panel_path, backend="duckdb")
+    assert duckdb_panel.index.names == ["Year", "State"], "Panel rollup should be keyed by year and state"
+    assert np.allclose(duckdb_panel.loc[pandas_panel.index], pandas_panel, rtol=1e-6), \
+        "Panel rollups should match"
+
+    print("DuckDB backend test passed")
+    return True
+
+def test_shared_memory_shards():
+    """Test that shards survive a round trip through shared memory."""
+    print("Testing shared memory shards...")
+
+    shard = apply_schema(pd.DataFrame({
+        'FIPS': ['06001', '06003', '06005'],
+        'RegionName': ['Alameda County', None, 'Amador County'],
+        'County': ['Alameda County', 'Alpine County', 'Amador County'],
+        'State': ['CA', 'CA', 'CA'],
+        'MedianHomeValue': [1000000.0, 500000.0, 400000.0],
+        'Population': [1600000, np.nan, 40000]
+    }), "Test")
+
+    handle = share_frame(shard)
+    try:
+        restored = attach_frame(handle)
+    finally:
+        release_frame(handle)
+
+    pd.testing.assert_frame_equal(restored, shard)
+    assert restored['Population'].isna().sum() == 1, "Missing values should be preserved"
+    assert restored['RegionName'].isna().sum() == 1, "Missing strings should not become 'nan'"
+
+    print("Shared memory shards test passed")
+    return True
+
+@contextlib.contextmanager
+def source_environment(mode, fixture_dir):
+    """Temporarily set the source mode and fixture directory."""
+    saved = {var: os.environ.get(var) for var in ("PIPELINE_SOURCE_MODE", "PIPELINE_FIXTURE_DIR")}
+    os.environ["PIPELINE_SOURCE_MODE"] = mode
+    os.environ["PIPELINE_FIXTURE_DIR"] = fixture_dir
+    try:
+        yield
+    finally:
+        for var, value in saved.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+
+def test_sharded_pipeline_matches_national():
+    """Test that the per-state sharded pipeline reproduces the national merge."""
+    print("Testing sharded pipeline...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = os.path.join(tmp, "fixtures")
+        write_synthetic_fixtures(fixtures, 300, 3)
+
+        with source_environment("replay", fixtures):
+            national = run_pipeline(outputs=["data"], output_dir=os.path.join(tmp, "national"))
+            sharded = run_sharded_pipeline(os.path.join(tmp, "sharded"), max_workers=2)
+
+    assert national is not None and sharded is not None, "Both pipelines should complete"
+    national = national.sort_values('FIPS').reset_index(drop=True)
+    reduced = sharded['merged_data'].sort_values('FIPS').reset_index(drop=True)
+    pd.testing.assert_frame_equal(reduced[national.columns], national, check_categorical=False)
+
+    print("Sharded pipeline test passed")
+    return True
+
+def test_multi_year_pipeline():
+    """Test that two configured years are fetched, processed and stacked into a panel."""
+    print("Testing multi-year pipeline...")
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            mock.patch.dict(BLS_FILE_IDS, {2021: "synthetic-2021"}):
+        fixtures = os.path.join(tmp, "fixtures")
+        for year in (2021, 2022):
+            write_synthetic_fixtures(fixtures, 300, 13, year=year)
+
+        with source_environment("replay", fixtures):
+            panel = run_multi_year_pipeline(2020, 2022, tmp, max_workers=2)
+
+        assert panel is not None, "Multi-year pipeline should complete"
+        assert sorted(panel['Year'].unique()) == [2021, 2022], "Unconfigured 2020 should be skipped"
+        for year in (2021, 2022):
+            assert os.path.exists(os.path.join(tmp, str(year), 'state_level_statistics.csv')), \
+                "Each year should be analyzed in its own directory"
+        values = panel.pivot(index='FIPS', columns='Year', values='MedianHomeValue').dropna()
+        assert (values[2021] != values[2022]).any(), "Each year should use its own Zillow month"
+        state_stats = pd.read_csv(os.path.join(tmp, 'panel_state_statistics.csv'))
+        assert set(state_stats['Year']) == {2021, 2022}, "Panel rollup should cover both years"
+
+    print("Multi-year pipeline test passed")
+    return True
+
+def test_record_and_replay():
+    """Test that recorded sources replay without network access or an API key."""
+    print("Testing record and replay...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source_path = os.path.join(tmp, "source.csv")
+        pd.DataFrame({'FIPS': ['06001'], 'Value': [1.5]}).to_csv(source_path, index=False)
+        url = "file://" + source_path
+        rows = [{'NAME': 'Alameda County, California', 'state': '06', 'county': '001'}]
+        fixtures = os.path.join(tmp, "fixtures")
+
+        def offline():
+            raise AssertionError("Replay should not fetch")
+
+        with source_environment("record", fixtures):
+            recorded = pd.read_csv(open_csv_source(url, "test"))
+            assert census_rows(lambda: rows, ['NAME'], 2022, '06') == rows
+
+        os.remove(source_path)
+        with source_environment("replay", fixtures):
+            pd.testing.assert_frame_equal(pd.read_csv(open_csv_source(url, "test")), recorded)
+            assert census_rows(offline, ['NAME'], 2022, '06') == rows
+
+            # Synthetic fixtures stand in for recorded live sources
+            write_synthetic_fixtures(fixtures, 200, 3)
+            assert len(load_bls_data()) > 150, "BLS data should replay from fixtures"
+            assert len(load_census_economic_data(state_fips='06')) == 4, \
+                "Per-state Census requests should replay from fixtures"
+
+    print("Record and replay test passed")
+    return True
+
+def test_cli_output_selection():
+    """Test that the CLI runs only the selected outputs and dry runs write nothing."""
+    print("Testing CLI output selection...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = os.path.join(tmp, "fixtures")
+        output_dir = os.path.join(tmp, "output")
+        write_synthetic_fixtures(fixtures, 300, 3)
+
+        with source_environment("replay", fixtures):
+            assert pipeline_main(["--dry-run", "--output-dir", output_dir]) == 0
+            assert not os.path.exists(output_dir), "A dry run should not write files"
+
+            assert pipeline_main([
+                "--outputs", "stats", "correlations", "--format", "json",
+                "--output-dir", output_dir, "--quiet"
+            ]) == 0
+
+        written = sorted(os.listdir(output_dir))
+        assert written == ["correlation_matrix.json", "descriptive_statistics.json"], \
+            f"Only the selected outputs should be written, got {written}"
+
+        # Skipped sources are left out of the merge, so figures cannot be drawn
+        try:
+            pipeline_main(["--sources", "zillow", "census", "--outputs", "figures", "--dry-run"])
+            assert False, "Figures without all sources should be rejected"
+        except SystemExit as e:
+            assert e.code == 2
+
+    print("CLI output selection test passed")
+    return True
+
+def test_report_section_cache():
+    """Test that report sections are rebuilt only when their data changes."""
+    print("Testing report section cache...")
+
+    merged = _synthetic_merged(200, seed=5, n_months=3)
+    clusters = pd.DataFrame({'FIPS': merged['FIPS'], 'Cluster': np.arange(len(merged)) % 3})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        first = build_report(merged, {'clusters': clusters}, tmp)
+        assert first['cached'] == [], "The first build should render every section"
+        assert first['rendered'][-1] == 'clusters', "Extra results should get a section"
+
+        second = build_report(merged, {'clusters': clusters}, tmp)
+        assert second['rendered'] == [], "Unchanged data should reuse every section"
+
+        clusters['Cluster'] = clusters['Cluster'] + 1
+        third = build_report(merged, {'clusters': clusters}, tmp)
+        assert third['rendered'] == ['clusters'], "Only the changed section should be rebuilt"
+
+        with open(third['path']) as f:
+            page = f.read()
+        assert 'data:image/png;base64,' in page, "Figures should be embedded in the page"
+        assert len(os.listdir(os.path.join(tmp, '.report_cache'))) == len(first['rendered']), \
+            "Stale section renders should be removed"
+
+    print("Report section cache test passed")
+    return True
+
+def test_spatial_weights():
+    """Test adjacency loading, spatial lags and Moran's I on a chain of counties."""
+    print("Testing spatial weights...")
+
+    # Census layout: continuation rows leave the county columns empty
+    census_layout = (
+        '"A County, CA"\t06001\t"A County, CA"\t06001\n'
+        '\t\t"B County, CA"\t06003\n'
+        '"B County, CA"\t06003\t"A County, CA"\t06001\n'
+        '\t\t"C County, CA"\t06005\n'
+        '"C County, CA"\t06005\t"B County, CA"\t06003\n'
+        '\t\t"D County, CA"\t06007\n'
+    )
+    merged = pd.DataFrame({
+        'FIPS': ['06001', '06003', '06005', '06007'],
+        'MedianHomeValue': [100.0, 200.0, 300.0, np.nan],
+        'Median_Income': [1.0, 2.0, 3.0, 4.0]
+    })
+
+    with tempfile.TemporaryDirectory() as tmp:
+        census_path = os.path.join(tmp, 'county_adjacency.txt')
+        with open(census_path, 'w') as f:
+            f.write(census_layout)
+        csv_path = os.path.join(tmp, 'adjacency.csv')
+        pd.DataFrame({'FIPS': ['06001', '06003', '06005'],
+                      'NeighborFIPS': ['06003', '06005', '06007']}).to_csv(csv_path, index=False)
+
+        weights = build_weights(load_adjacency(census_path), merged['FIPS'])
+        from_csv = build_weights(load_adjacency(csv_path), merged['FIPS'])
+
+    assert (weights != from_csv).nnz == 0, "Both file layouts should give the same matrix"
+    assert np.allclose(np.asarray(weights.sum(axis=1)).ravel(), 1), "Rows should sum to one"
+
+    lagged = add_spatial_lags(merged, weights, ['MedianHomeValue', 'Median_Income'])
+    assert np.allclose(lagged['MedianHomeValue_Lag'], [200, 200, 200, 300]), \
+        "Missing neighbor values should be left out of the lag"
+    assert np.allclose(lagged['Median_Income_Lag'], [2, 2, 3, 3])
+
+    values = merged['Median_Income'].to_numpy()
+    dense = weights.toarray()
+    deviations = values - values.mean()
+    expected = len(values) / dense.sum() * deviations @ dense @ deviations / (deviations @ deviations)
+    assert np.isclose(morans_i(weights, values)['MoransI'], expected), \
+        "Sparse Moran's I should match the dense formula"
+
+    print("Spatial weights test passed")
+    return True
+
 def run_all_tests():
     """Run all unit tests and provide a summary."""
     print("=" * 60)
@@ -179,7 +651,20 @@ def run_all_tests():
         ("Data Cleaning Logic", test_data_cleaning_logic),
         ("Data Merging Logic", test_data_merging_logic),
         ("Missing Value Handling", test_missing_value_handling),
-        ("Column Validation", test_column_validation)
+        ("Column Validation", test_column_validation),
+        ("Similar Counties", test_similar_counties),
+        ("Query Service", test_query_service),
+        ("Synthetic Pipeline", test_synthetic_pipeline),
+        ("Year Alignment", test_year_alignment),
+        ("Schema Enforcement", test_schema_enforcement),
+        ("DuckDB Backend", test_duckdb_backend_matches_pandas),
+        ("Shared Memory Shards", test_shared_memory_shards),
+        ("Sharded Pipeline", test_sharded_pipeline_matches_national),
+        ("Multi-Year Pipeline", test_multi_year_pipeline),
+        ("Record and Replay", test_record_and_replay),
+        ("CLI Output Selection", test_cli_output_selection),
+        ("Report Section Cache", test_report_section_cache),
+        ("Spatial Weights", test_spatial_weights)
     ]
 
     results = []
@@ -188,6 +673,10 @@ def run_all_tests():
         try:
             success = test_func()
             results.append((test_name, success))
+        except unittest.SkipTest as e:
+            # Skipped tests checked nothing, so they count neither as passed nor failed
+            print(f"Skipping {test_name}: {e}")
+            results.append((test_name, None))
         except Exception as e:
             print(f"Error in {test_name}: {str(e)}")
             results.append((test_name, False))
@@ -199,13 +688,14 @@ def run_all_tests():
 
     passed = 0
     for test_name, success in results:
-        status = "PASSED" if success else "FAILED"
+        status = "SKIPPED" if success is None else "PASSED" if success else "FAILED"
         print(f"{test_name}: {status}")
         if success:
             passed += 1
 
-    total = len(results)
-    print(f"\nTotal: {passed}/{total} tests passed ({passed/total*100:.1f}%)")
+    skipped = sum(success is None for _, success in results)
+    total = len(results) - skipped
+    print(f"\nTotal: {passed}/{total} tests passed ({passed/total*100:.1f}%), {skipped} skipped")
 
     if passed == total:
         print("\nAll tests passed successfully!")